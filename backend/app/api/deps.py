@@ -1,45 +1,89 @@
+import hashlib
+import threading
+import time
 from typing import Generator, Optional
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
-from pydantic import ValidationError
-from sqlalchemy.orm import Session
+import jwt
+from sqlalchemy.orm import Session, make_transient_to_detached
 
-from app import crud, models, schemas
+from app import crud, models
 from app.core import security
 from app.core.config import settings
+from app.crud.user import cache_user, get_cached_user
 from app.db.session import SessionLocal
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
 
+# 令牌解码结果缓存: sha256(token) -> (user_id, exp)
+_payload_cache = TTLCache(maxsize=10000, ttl=30)
+# TTLCache不是线程安全的，同步依赖在线程池中并发执行，所有读写都需加锁
+_payload_cache_lock = threading.Lock()
+
 
 def get_db() -> Generator:
+    db = SessionLocal()
     try:
-        db = SessionLocal()
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
 
+def _decode_token_user_id(token: str) -> int:
+    """
+    解码JWT并返回sub中的用户ID，短时间内重复出现的令牌直接命中缓存
+    """
+    key = hashlib.sha256(token.encode()).hexdigest()
+    with _payload_cache_lock:
+        cached = _payload_cache.get(key)
+        if cached is not None:
+            user_id, exp = cached
+            # 缓存不能延长令牌的有效期
+            if exp is None or exp > time.time():
+                return user_id
+            _payload_cache.pop(key, None)
+
+    payload = security.decode_access_token(token)
+    # 只需要sub，直接读取而无需构造TokenPayload模型
+    sub = payload.get("sub")
+    if not sub:
+        raise jwt.InvalidTokenError("Token has no subject")
+    user_id = int(sub)
+    with _payload_cache_lock:
+        _payload_cache[key] = (user_id, payload.get("exp"))
+    return user_id
+
+
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
 ) -> models.User:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
-        token_data = schemas.TokenPayload(**payload)
-    except (jwt.JWTError, ValidationError):
+        user_id = _decode_token_user_id(token)
+    except (jwt.PyJWTError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="无法验证凭据",
         )
-    user = crud.user.get(db, id=token_data.sub)
+    snapshot = get_cached_user(user_id)
+    if snapshot is not None:
+        # 以快照构造对象并标记为已持久化（detached），再挂到当前会话，无需再次SELECT
+        # 快照不含密码哈希，只有访问该属性时才会从数据库加载
+        user = models.User(**snapshot)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    user = crud.user.get(db, id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="用户不存在")
+    cache_user(user)
     return user
 
 
@@ -54,7 +98,7 @@ def get_current_active_user(
 def get_current_admin_user(
     current_user: models.User = Depends(get_current_active_user),
 ) -> models.User:
-    if current_user.role != "admin":
+    if current_user.role not in security.ADMIN_ROLES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="权限不足"
         )
@@ -64,7 +108,7 @@ def get_current_admin_user(
 def get_current_analyst_user(
     current_user: models.User = Depends(get_current_active_user),
 ) -> models.User:
-    if current_user.role not in ["admin", "analyst"]:
+    if current_user.role not in security.ANALYST_ROLES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="权限不足"
         )
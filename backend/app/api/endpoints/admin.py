@@ -1,18 +1,41 @@
+import json
 from typing import Any, List
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import case, func, text
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
 from app.services.audit_log import log_user_action
 from app.core.config import settings
+from app.db.session import redis_client
 
 router = APIRouter()
 
+# 统计数据为全局数据，所有管理员共享同一份缓存
+ADMIN_STATS_CACHE_TTL = 60
 
-@router.get("/audit-logs", response_model=List[schemas.AuditLog])
+# 估算行数低于该值时表仍较小，直接精确计数
+ESTIMATE_MIN_ROWS = 1000
+
+
+def _estimate_count(db: Session, model) -> int:
+    """
+    获取表的总行数，PostgreSQL大表使用pg_class.reltuples估算值以避免全表扫描
+    """
+    if db.bind.dialect.name == "postgresql":
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+            {"table": model.__tablename__},
+        ).scalar()
+        if estimate is not None and estimate >= ESTIMATE_MIN_ROWS:
+            return int(estimate)
+    return db.query(func.count(model.id)).scalar()
+
+
+@router.get("/audit-logs", response_model=List[schemas.AuditLog], response_model_exclude_unset=True)
 def get_audit_logs(
     *,
     db: Session = Depends(deps.get_db),
@@ -54,28 +77,40 @@ def get_user_stats(
     """
     获取用户统计信息（仅限管理员）
     """
+    cache_key = "admin_stats:users"
+    cached_stats = redis_client.get(cache_key)
+    if cached_stats:
+        return json.loads(cached_stats)
+    
     # 获取总用户数
-    total_users = db.query(models.User).count()
+    total_users = _estimate_count(db, models.User)
     
-    # 获取活跃用户数
-    active_users = db.query(models.User).filter(models.User.is_active == True).count()
+    # 活跃用户数和最近7天新增用户在一条查询中统计
+    week_ago = datetime.utcnow() - timedelta(days=7)
+    active_users, new_users = db.query(
+        func.sum(case((models.User.is_active == True, 1), else_=0)),
+        func.sum(case((models.User.created_at >= week_ago, 1), else_=0)),
+    ).one()
     
     # 按角色分组统计
-    role_counts = {}
-    roles = ["admin", "analyst", "viewer"]
-    for role in roles:
-        role_counts[role] = db.query(models.User).filter(models.User.role == role).count()
-    
-    # 最近7天新增用户
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    new_users = db.query(models.User).filter(models.User.created_at >= week_ago).count()
+    role_counts = {role: 0 for role in ["admin", "analyst", "viewer"]}
+    role_counts.update(
+        db.query(models.User.role, func.count(models.User.id))
+        .group_by(models.User.role)
+        .all()
+    )
     
-    return {
+    stats = {
         "total_users": total_users,
-        "active_users": active_users,
+        "active_users": int(active_users or 0),
         "by_role": role_counts,
-        "new_users_last_7days": new_users
+        "new_users_last_7days": int(new_users or 0)
     }
+    
+    # 缓存结果（1分钟）
+    redis_client.setex(cache_key, ADMIN_STATS_CACHE_TTL, json.dumps(stats, ensure_ascii=False))
+    
+    return stats
 
 
 @router.get("/stats/documents", response_model=dict)
@@ -86,16 +121,13 @@ def get_document_stats(
     """
     获取文档统计信息（仅限管理员）
     """
-    # 获取总文档数
-    total_documents = db.query(models.DocumentUpload).count()
+    cache_key = "admin_stats:documents"
+    cached_stats = redis_client.get(cache_key)
+    if cached_stats:
+        return json.loads(cached_stats)
     
-    # 按类型分组统计
-    type_counts = {}
-    file_types = ["pdf", "docx", "html"]
-    for file_type in file_types:
-        type_counts[file_type] = db.query(models.DocumentUpload).filter(
-            models.DocumentUpload.file_type == file_type
-        ).count()
+    # 获取总文档数
+    total_documents = _estimate_count(db, models.DocumentUpload)
     
     # 最近7天上传的文档
     week_ago = datetime.utcnow() - timedelta(days=7)
@@ -103,18 +135,32 @@ def get_document_stats(
         models.DocumentUpload.upload_time >= week_ago
     ).count()
     
+    # 按类型分组统计
+    type_counts = {file_type: 0 for file_type in ["pdf", "docx", "html"]}
+    type_counts.update(
+        db.query(models.DocumentUpload.file_type, func.count(models.DocumentUpload.id))
+        .group_by(models.DocumentUpload.file_type)
+        .all()
+    )
+    
     # 按分类统计
-    category_counts = {}
-    categories = db.query(models.DocumentClassification.category).distinct().all()
-    for category in categories:
-        category_name = category[0]
-        category_counts[category_name] = db.query(models.DocumentClassification).filter(
-            models.DocumentClassification.category == category_name
-        ).count()
+    category_counts = dict(
+        db.query(
+            models.DocumentClassification.category,
+            func.count(models.DocumentClassification.id),
+        )
+        .group_by(models.DocumentClassification.category)
+        .all()
+    )
     
-    return {
+    stats = {
         "total_documents": total_documents,
         "by_type": type_counts,
         "by_category": category_counts,
-        "new_documents_last_7days": new_documents
-    } 
\ No newline at end of file
+        "new_documents_last_7days": int(new_documents or 0)
+    }
+    
+    # 缓存结果（1分钟）
+    redis_client.setex(cache_key, ADMIN_STATS_CACHE_TTL, json.dumps(stats, ensure_ascii=False))
+    
+    return stats 
\ No newline at end of file
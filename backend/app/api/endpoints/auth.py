@@ -1,7 +1,10 @@
+import asyncio
+import threading
 from datetime import timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -13,25 +16,66 @@ from app.services.audit_log import log_user_action
 
 router = APIRouter()
 
+# 登录失败次数: (ip, email) -> 次数，最后一次失败60秒后过期
+_failed_attempts = TTLCache(maxsize=10000, ttl=60)
+# TTLCache不是线程安全的，检查和计数在同一把锁内完成
+_failed_attempts_lock = threading.Lock()
+MAX_FAILED_ATTEMPTS = 5
+
+
+def _reserve_login_attempt(attempt_key) -> bool:
+    """
+    在验证密码之前先计入一次尝试，超过次数上限时返回False
+
+    检查与计数在锁内一起完成，并发的错误登录不会都通过检查而超过上限；登录成功后清除计数
+    """
+    with _failed_attempts_lock:
+        attempts = _failed_attempts.get(attempt_key, 0)
+        if attempts >= MAX_FAILED_ATTEMPTS:
+            return False
+        _failed_attempts[attempt_key] = attempts + 1
+        return True
+
+
+def _clear_login_attempts(attempt_key) -> None:
+    with _failed_attempts_lock:
+        _failed_attempts.pop(attempt_key, None)
+
 
 @router.post("/login", response_model=schemas.Token)
-def login_access_token(
+async def login_access_token(
+    request: Request,
     db: Session = Depends(deps.get_db),
     form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = crud.user.authenticate(
+    # 失败次数过多时直接拒绝，不再进行密码哈希验证
+    attempt_key = (request.client.host if request.client else None, form_data.username)
+    if not _reserve_login_attempt(attempt_key):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="登录失败次数过多，请稍后再试",
+        )
+    
+    # 密码哈希验证是CPU密集型操作，放到线程池中执行以免阻塞事件循环
+    user = await asyncio.to_thread(
+        crud.user.authenticate,
         db, email=form_data.username, password=form_data.password
     )
     if not user:
+        # 本次尝试已在验证前计入
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="邮箱或密码不正确",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    elif not user.is_active:
+    
+    # 密码正确，清除失败计数
+    _clear_login_attempts(attempt_key)
+    
+    if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="用户未激活",
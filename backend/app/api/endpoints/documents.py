@@ -1,6 +1,8 @@
 import os
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, BackgroundTasks
+import shutil
+from typing import Any, BinaryIO, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, status, UploadFile, File, Form, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
@@ -9,9 +11,36 @@ from app.services.audit_log import log_user_action
 from app.services.document_processor import process_document
 from app.services.rabbitmq_tasks import submit_document_for_processing
 from app.core.config import settings
+from app.core.security import ADMIN_ROLES, ANALYST_ROLES
 
 router = APIRouter()
 
+# 上传文件分块写入磁盘的块大小
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# 支持的文件扩展名与文件类型的对应关系
+EXTENSION_FILE_TYPES = {
+    ".pdf": "pdf",
+    ".docx": "docx",
+    ".html": "html",
+}
+
+
+def _save_upload(source: BinaryIO, file_path: str) -> int:
+    """将上传文件分块写入磁盘，返回文件大小"""
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(source, f, length=UPLOAD_CHUNK_SIZE)
+    return os.path.getsize(file_path)
+
+
+def _remove_files(file_paths: List[str]) -> None:
+    """删除已上传的文件"""
+    for file_path in file_paths:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass  # 文件可能已经不存在
+
 
 @router.post("/upload", response_model=schemas.DocumentUpload)
 async def upload_document(
@@ -26,8 +55,9 @@ async def upload_document(
     # 检查文件类型
     filename = file.filename
     file_extension = os.path.splitext(filename)[1].lower()
+    file_type = EXTENSION_FILE_TYPES.get(file_extension)
     
-    if file_extension not in [".pdf", ".docx", ".html"]:
+    if file_type is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="不支持的文件格式，仅支持PDF、DOCX和HTML格式"
@@ -39,26 +69,14 @@ async def upload_document(
     
     # 保存文件
     file_path = os.path.join(upload_dir, filename)
-    content = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(content)
-    
-    # 确定文件类型
-    if file_extension == ".pdf":
-        file_type = "pdf"
-    elif file_extension == ".docx":
-        file_type = "docx"
-    elif file_extension == ".html":
-        file_type = "html"
-    else:
-        file_type = "unknown"
+    file_size = await run_in_threadpool(_save_upload, file.file, file_path)
     
     # 创建文档记录
     document_in = schemas.DocumentUploadCreate(
         filename=filename,
         file_type=file_type,
         original_filename=filename,
-        file_size=len(content),
+        file_size=file_size,
         upload_path=file_path,
         uploader_id=current_user.id
     )
@@ -94,24 +112,22 @@ def get_document(
     """
     获取文档信息
     """
-    document = crud.document.get(db, id=document_id)
+    # 权限条件直接作为查询条件：普通用户只能查到自己的文档
+    document = crud.document.get_for_uploader(
+        db,
+        id=document_id,
+        uploader_id=None if current_user.role in ANALYST_ROLES else current_user.id
+    )
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="文档不存在"
         )
     
-    # 检查权限
-    if document.uploader_id != current_user.id and current_user.role not in ["admin", "analyst"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="无权访问该文档"
-        )
-    
     return document
 
 
-@router.get("/", response_model=List[schemas.DocumentUpload])
+@router.get("/", response_model=List[schemas.DocumentUpload], response_model_exclude_unset=True)
 def get_documents(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
@@ -122,7 +138,7 @@ def get_documents(
     获取文档列表
     """
     # 普通用户只能看自己的文档，管理员和分析师可以看所有文档
-    if current_user.role in ["admin", "analyst"]:
+    if current_user.role in ANALYST_ROLES:
         documents = crud.document.get_multi(db, skip=skip, limit=limit)
     else:
         documents = crud.document.get_by_uploader(
@@ -132,9 +148,62 @@ def get_documents(
     return documents
 
 
+@router.post("/delete-batch", response_model=List[schemas.DocumentUpload])
+def delete_documents(
+    background_tasks: BackgroundTasks,
+    document_ids: List[int] = Body(..., embed=True),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    批量删除文档
+    """
+    document_ids = list(set(document_ids))
+    documents = (
+        db.query(models.DocumentUpload)
+        .filter(models.DocumentUpload.id.in_(document_ids))
+        .all()
+    )
+    if len(documents) != len(document_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="文档不存在"
+        )
+    
+    # 检查权限
+    if current_user.role not in ADMIN_ROLES and any(
+        document.uploader_id != current_user.id for document in documents
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="无权删除该文档"
+        )
+    
+    # 删除前序列化，提交后ORM对象将不可用
+    deleted = [schemas.DocumentUpload.from_orm(document) for document in documents]
+    
+    # 一次删除所有数据库记录
+    crud.document.remove_multi(db, ids=document_ids)
+    
+    # 在响应返回后删除文件
+    background_tasks.add_task(_remove_files, [document.upload_path for document in deleted])
+    
+    # 记录审计日志
+    log_user_action(
+        db=db,
+        user_id=current_user.id,
+        action="delete",
+        resource_type="document",
+        details=f"用户批量删除文档: {', '.join(str(i) for i in sorted(document_ids))}"
+    )
+    
+    return deleted
+
+
 @router.delete("/{document_id}", response_model=schemas.DocumentUpload)
 def delete_document(
     document_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
@@ -149,20 +218,17 @@ def delete_document(
         )
     
     # 检查权限
-    if document.uploader_id != current_user.id and current_user.role != "admin":
+    if document.uploader_id != current_user.id and current_user.role not in ADMIN_ROLES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="无权删除该文档"
         )
     
-    # 删除文件
-    try:
-        os.remove(document.upload_path)
-    except OSError:
-        pass  # 文件可能已经不存在
-    
     # 删除数据库记录
-    document = crud.document.remove(db, id=document_id)
+    document = crud.document.remove(db, db_obj=document)
+    
+    # 在响应返回后删除文件
+    background_tasks.add_task(_remove_files, [document.upload_path])
     
     # 记录审计日志
     log_user_action(
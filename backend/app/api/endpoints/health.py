@@ -1,17 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-import redis
-import requests
-from pymongo import MongoClient
-from elasticsearch import Elasticsearch
-import pika
-from typing import Dict, Any
-
-from app.api.deps import get_db
-from app.core.config import settings
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import APIRouter
+import pymongo
+from sqlalchemy import text
+from typing import Dict, Any, Callable
+
+from app.db.session import engine, mongo_client, es_client, redis_client, get_rabbitmq_connection
 
 router = APIRouter()
 
+# 单个组件检查的超时时间（秒）
+HEALTH_CHECK_TIMEOUT = 2
+
+
+def _check_database() -> None:
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def _check_mongodb() -> None:
+    # 发送管理命令以验证连接；共享客户端的选择服务器超时较长，这里限制整个操作的时间
+    with pymongo.timeout(HEALTH_CHECK_TIMEOUT):
+        mongo_client.admin.command("ping")
+
+
+def _check_elasticsearch() -> None:
+    if not es_client.options(request_timeout=HEALTH_CHECK_TIMEOUT).ping():
+        raise Exception("无法连接到Elasticsearch")
+
+
+def _check_redis() -> None:
+    # 连接池已设置连接和命令超时
+    redis_client.ping()
+
+
+def _check_rabbitmq() -> None:
+    connection = get_rabbitmq_connection(timeout=HEALTH_CHECK_TIMEOUT)
+    connection.close()
+
+
+HEALTH_CHECKS: Dict[str, Callable[[], None]] = {
+    "database": _check_database,
+    "mongodb": _check_mongodb,
+    "elasticsearch": _check_elasticsearch,
+    "redis": _check_redis,
+    "rabbitmq": _check_rabbitmq,
+}
+
+
+# 检查专用的线程池：超时只是放弃等待，阻塞的线程会继续运行，
+# 不使用默认线程池，避免组件故障时卡住的检查占满登录、审计日志等共用的线程
+_health_executor = ThreadPoolExecutor(max_workers=len(HEALTH_CHECKS), thread_name_prefix="health")
+
+
+async def _run_check(check: Callable[[], None]) -> None:
+    """在专用线程池中执行阻塞的检查，并限制最长等待时间"""
+    loop = asyncio.get_running_loop()
+    await asyncio.wait_for(
+        loop.run_in_executor(_health_executor, check), timeout=HEALTH_CHECK_TIMEOUT
+    )
+
 
 @router.get("/", response_model=Dict[str, Any])
 async def health_check():
@@ -24,77 +72,29 @@ async def health_check():
         "components": {}
     }
     
-    # 检查数据库连接
-    try:
-        # 数据库检查在依赖注入get_db中进行
-        health_status["components"]["database"] = {
-            "status": "ok"
-        }
-    except Exception as e:
-        health_status["components"]["database"] = {
-            "status": "error",
-            "message": str(e)
-        }
-        health_status["status"] = "degraded"
-    
-    # 检查MongoDB
-    try:
-        mongo_client = MongoClient(settings.MONGODB_URL, serverSelectionTimeoutMS=2000)
-        mongo_client.server_info()  # 发送管理命令以验证连接
-        health_status["components"]["mongodb"] = {
-            "status": "ok"
-        }
-    except Exception as e:
-        health_status["components"]["mongodb"] = {
-            "status": "error",
-            "message": str(e)
-        }
-        health_status["status"] = "degraded"
+    # 并发检查各组件，总耗时取决于最慢的组件
+    results = await asyncio.gather(
+        *(_run_check(check) for check in HEALTH_CHECKS.values()),
+        return_exceptions=True
+    )
     
-    # 检查Elasticsearch
-    try:
-        es = Elasticsearch(settings.ELASTICSEARCH_URL)
-        if es.ping():
-            health_status["components"]["elasticsearch"] = {
-                "status": "ok"
+    for name, result in zip(HEALTH_CHECKS, results):
+        if isinstance(result, asyncio.TimeoutError):
+            health_status["components"][name] = {
+                "status": "error",
+                "message": f"检查超时（{HEALTH_CHECK_TIMEOUT}秒）"
+            }
+            health_status["status"] = "degraded"
+        elif isinstance(result, Exception):
+            health_status["components"][name] = {
+                "status": "error",
+                "message": str(result)
             }
+            health_status["status"] = "degraded"
         else:
-            raise Exception("无法连接到Elasticsearch")
-    except Exception as e:
-        health_status["components"]["elasticsearch"] = {
-            "status": "error",
-            "message": str(e)
-        }
-        health_status["status"] = "degraded"
-    
-    # 检查Redis
-    try:
-        redis_client = redis.from_url(settings.REDIS_URL)
-        redis_client.ping()
-        health_status["components"]["redis"] = {
-            "status": "ok"
-        }
-    except Exception as e:
-        health_status["components"]["redis"] = {
-            "status": "error",
-            "message": str(e)
-        }
-        health_status["status"] = "degraded"
-    
-    # 检查RabbitMQ
-    try:
-        connection_params = pika.URLParameters(settings.RABBITMQ_URL)
-        connection = pika.BlockingConnection(connection_params)
-        connection.close()
-        health_status["components"]["rabbitmq"] = {
-            "status": "ok"
-        }
-    except Exception as e:
-        health_status["components"]["rabbitmq"] = {
-            "status": "error",
-            "message": str(e)
-        }
-        health_status["status"] = "degraded"
+            health_status["components"][name] = {
+                "status": "ok"
+            }
     
     return health_status
 
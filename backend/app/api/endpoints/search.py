@@ -1,11 +1,14 @@
+import json
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
 from app.services.audit_log import log_user_action
 from app.services.search import search_documents
+from app.core.security import ANALYST_ROLES
 from app.db.session import redis_client
 
 router = APIRouter()
@@ -33,7 +36,7 @@ def search(
             action="search",
             details=f"用户搜索文档(缓存): {query}"
         )
-        return cached_results.decode("utf-8")
+        return json.loads(cached_results)
     
     # 执行搜索
     results = search_documents(db, query, category, current_user)
@@ -48,7 +51,7 @@ def search(
     
     # 缓存结果（5分钟）
     if results:
-        redis_client.setex(cache_key, 300, str(results))
+        redis_client.setex(cache_key, 300, json.dumps(jsonable_encoder(results)))
     
     return results
 
@@ -69,10 +72,10 @@ def get_by_category(
     cached_results = redis_client.get(cache_key)
     
     if cached_results:
-        return cached_results.decode("utf-8")
+        return json.loads(cached_results)
     
     # 非管理员和分析师只能查看自己的文档
-    if current_user.role in ["admin", "analyst"]:
+    if current_user.role in ANALYST_ROLES:
         documents = crud.document.get_by_category(
             db, category=category, skip=skip, limit=limit
         )
@@ -91,6 +94,7 @@ def get_by_category(
     
     # 缓存结果（5分钟）
     if documents:
-        redis_client.setex(cache_key, 300, str(documents))
+        payload = [schemas.DocumentUpload.from_orm(document) for document in documents]
+        redis_client.setex(cache_key, 300, json.dumps(jsonable_encoder(payload)))
     
     return documents 
\ No newline at end of file
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.core.security import ADMIN_ROLES
 from app.services.audit_log import log_user_action
 
 router = APIRouter()
@@ -89,7 +90,7 @@ def read_user_by_id(
     user = crud.user.get(db, id=user_id)
     if user == current_user:
         return user
-    if not current_user.role == "admin":
+    if current_user.role not in ADMIN_ROLES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="权限不足",
@@ -97,7 +98,7 @@ def read_user_by_id(
     return user
 
 
-@router.get("/", response_model=List[schemas.User])
+@router.get("/", response_model=List[schemas.User], response_model_exclude_unset=True)
 def read_users(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
-from typing import Any, Union, Dict, Optional
+from typing import Any, Union, Dict, Optional, Tuple
 
-from jose import jwt
+import jwt
 from passlib.context import CryptContext
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
@@ -11,9 +11,22 @@ import string
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 新密码使用argon2哈希，旧的bcrypt哈希仍可验证并在登录时自动升级
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
 
 ALGORITHM = "HS256"
+# 预先编码签名密钥，避免每次签发/验证时重复编码
+_JWT_KEY = settings.SECRET_KEY.encode()
+
+# 角色权限集合
+ADMIN_ROLES = frozenset({"admin"})
+ANALYST_ROLES = frozenset({"admin", "analyst"})
 
 
 def create_access_token(
@@ -29,10 +42,17 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    验证并解码JWT访问令牌，令牌无效时抛出jwt.PyJWTError
+    """
+    return jwt.decode(token, _JWT_KEY, algorithms=[ALGORITHM])
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     验证密码是否匹配哈希值
@@ -40,6 +60,15 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    验证密码，如果哈希方案或参数已过时则同时返回新的哈希值
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """
     获取密码的哈希值
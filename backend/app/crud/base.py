@@ -64,9 +64,11 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.refresh(db_obj)
         return db_obj
 
-    def remove(self, db: Session, *, id: int) -> ModelType:
-        """删除对象"""
-        obj = db.query(self.model).get(id)
+    def remove(
+        self, db: Session, *, id: Optional[int] = None, db_obj: Optional[ModelType] = None
+    ) -> ModelType:
+        """删除对象，已加载的对象可直接传入db_obj以避免重复查询"""
+        obj = db_obj if db_obj is not None else db.query(self.model).get(id)
         db.delete(obj)
         db.commit()
         return obj 
\ No newline at end of file
@@ -1,22 +1,44 @@
 from typing import List, Optional
 
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import desc, insert
 
 from app.crud.base import CRUDBase
-from app.models.document import DocumentUpload
+from app.models.document import DocumentUpload, DocumentClassification
 from app.schemas.document import DocumentUploadCreate, DocumentUpload as DocumentUploadSchema
 
 
 class CRUDDocument(CRUDBase[DocumentUpload, DocumentUploadCreate, DocumentUploadSchema]):
     """文档CRUD操作类"""
     
+    def get_multi(
+        self, db: Session, *, skip: int = 0, limit: int = 100
+    ) -> List[DocumentUpload]:
+        """获取多个文档，并预加载分类结果"""
+        return (
+            db.query(self.model)
+            .options(selectinload(DocumentUpload.classifications))
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+    
+    def get_for_uploader(
+        self, db: Session, *, id: int, uploader_id: Optional[int] = None
+    ) -> Optional[DocumentUpload]:
+        """通过ID获取文档，指定uploader_id时仅返回该用户上传的文档"""
+        query = db.query(self.model).filter(DocumentUpload.id == id)
+        if uploader_id is not None:
+            query = query.filter(DocumentUpload.uploader_id == uploader_id)
+        return query.first()
+    
     def get_by_uploader(
         self, db: Session, *, uploader_id: int, skip: int = 0, limit: int = 100
     ) -> List[DocumentUpload]:
         """获取用户上传的文档"""
         return (
             db.query(self.model)
+            .options(selectinload(DocumentUpload.classifications))
             .filter(DocumentUpload.uploader_id == uploader_id)
             .order_by(desc(DocumentUpload.upload_time))
             .offset(skip)
@@ -31,7 +53,9 @@ class CRUDDocument(CRUDBase[DocumentUpload, DocumentUploadCreate, DocumentUpload
         return (
             db.query(self.model)
             .join(self.model.classifications)
-            .filter(self.model.classifications.any(category=category))
+            .filter(DocumentClassification.category == category)
+            .distinct()
+            .options(selectinload(DocumentUpload.classifications))
             .order_by(desc(DocumentUpload.upload_time))
             .offset(skip)
             .limit(limit)
@@ -46,14 +70,38 @@ class CRUDDocument(CRUDBase[DocumentUpload, DocumentUploadCreate, DocumentUpload
             db.query(self.model)
             .join(self.model.classifications)
             .filter(
-                self.model.classifications.any(category=category),
+                DocumentClassification.category == category,
                 DocumentUpload.uploader_id == uploader_id
             )
+            .distinct()
+            .options(selectinload(DocumentUpload.classifications))
             .order_by(desc(DocumentUpload.upload_time))
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    
+    def create_many(self, db: Session, *, objs_in: List[DocumentUploadCreate]) -> None:
+        """批量创建文档记录，一条多行INSERT写入并提交"""
+        if not objs_in:
+            return
+        db.execute(insert(DocumentUpload), [obj_in.dict() for obj_in in objs_in])
+        db.commit()
+    
+    def remove_multi(self, db: Session, *, ids: List[int]) -> int:
+        """批量删除文档，返回删除的记录数"""
+        # 与单条删除一致：解除分类结果与文档的关联
+        db.query(DocumentClassification).filter(
+            DocumentClassification.document_id.in_(ids)
+        ).update({DocumentClassification.document_id: None}, synchronize_session=False)
+        count = (
+            db.query(self.model)
+            .filter(DocumentUpload.id.in_(ids))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return count
+
 
 document = CRUDDocument(DocumentUpload) 
\ No newline at end of file
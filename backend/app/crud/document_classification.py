@@ -13,14 +13,45 @@ class CRUDDocumentClassification(CRUDBase[DocumentClassification, DocumentClassi
     def create_with_document(
         self, db: Session, *, obj_in: DocumentClassificationCreate, document_id: int
     ) -> DocumentClassification:
-        """创建文档分类记录"""
+        """
+        创建文档分类记录
+
+        只执行flush而不提交，由调用方（请求级事务或批处理任务）统一提交
+        """
         obj_in_data = obj_in.dict()
         db_obj = DocumentClassification(**obj_in_data, document_id=document_id)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
     
+    def create_many(
+        self,
+        db: Session,
+        *,
+        objs_in: List[DocumentClassificationCreate],
+        document_ids: List[int]
+    ) -> None:
+        """批量创建文档分类记录，一次写入并提交"""
+        db_objs = [
+            DocumentClassification(**obj_in.dict(), document_id=document_id)
+            for obj_in, document_id in zip(objs_in, document_ids)
+        ]
+        db.bulk_save_objects(db_objs, return_defaults=False)
+        db.commit()
+    
+    def remove_by_documents(
+        self, db: Session, *, document_ids: List[int], model_version: str
+    ) -> None:
+        """删除文档由指定模型版本生成的分类记录，不提交，便于重新处理时覆盖之前的结果"""
+        (
+            db.query(self.model)
+            .filter(
+                DocumentClassification.document_id.in_(document_ids),
+                DocumentClassification.model_version == model_version
+            )
+            .delete(synchronize_session=False)
+        )
+    
     def get_by_document(
         self, db: Session, *, document_id: int
     ) -> List[DocumentClassification]:
@@ -1,12 +1,46 @@
+import threading
 from typing import Any, Dict, Optional, Union
 
+from cachetools import TTLCache
 from sqlalchemy.orm import Session
 
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, verify_and_update_password
 from app.crud.base import CRUDBase
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
+# 用户列快照缓存: user_id -> {列名: 值}，供get_current_user使用，用户变更或删除时清除。
+# 缓存在每个进程内，多个uvicorn worker时其他进程最多在TTL（60秒）后才看到角色、激活状态的变更
+_user_cache = TTLCache(maxsize=10000, ttl=60)
+# TTLCache不是线程安全的，同步依赖在线程池中并发执行，所有读写都需加锁
+_user_cache_lock = threading.Lock()
+
+# 快照中不保存的列
+_USER_CACHE_EXCLUDE = {"hashed_password"}
+
+
+def get_cached_user(user_id: int) -> Optional[Dict[str, Any]]:
+    """获取缓存的用户列快照，未命中返回None"""
+    with _user_cache_lock:
+        return _user_cache.get(user_id)
+
+
+def cache_user(db_obj: User) -> None:
+    """缓存用户的列快照，不包含密码哈希"""
+    snapshot = {
+        column.name: getattr(db_obj, column.name)
+        for column in User.__table__.columns
+        if column.name not in _USER_CACHE_EXCLUDE
+    }
+    with _user_cache_lock:
+        _user_cache[db_obj.id] = snapshot
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """清除用户的缓存快照"""
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     """用户CRUD操作类"""
@@ -45,15 +79,33 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             hashed_password = get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        updated = super().update(db, db_obj=db_obj, obj_in=update_data)
+        invalidate_cached_user(updated.id)
+        return updated
+    
+    def remove(
+        self, db: Session, *, id: Optional[int] = None, db_obj: Optional[User] = None
+    ) -> User:
+        """删除用户"""
+        removed = super().remove(db, id=id, db_obj=db_obj)
+        invalidate_cached_user(removed.id)
+        return removed
     
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
         """验证用户"""
         user = self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        verified, new_hash = verify_and_update_password(password, user.hashed_password)
+        if not verified:
             return None
+        if new_hash:
+            # 升级旧的密码哈希
+            user.hashed_password = new_hash
+            db.add(user)
+            db.commit()
+            db.refresh(user)
+            invalidate_cached_user(user.id)
         return user
 
 
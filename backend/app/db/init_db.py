@@ -40,6 +40,8 @@ def init_elasticsearch():
                 "settings": {
                     "number_of_shards": 1,
                     "number_of_replicas": 0,
+                    "refresh_interval": settings.ELASTICSEARCH_REFRESH_INTERVAL,
+                    "translog.flush_threshold_size": settings.ELASTICSEARCH_TRANSLOG_FLUSH_THRESHOLD,
                     "analysis": {
                         "analyzer": {
                             "default": {
@@ -82,6 +84,38 @@ def init_elasticsearch():
             }
         )
         logging.info("Created Elasticsearch index: finance_docs")
+    else:
+        # 已有索引同步写入相关的动态设置，旧索引可能仍是默认的1秒刷新间隔
+        es_client.indices.put_settings(
+            index="finance_docs",
+            body={
+                "index": {
+                    "refresh_interval": settings.ELASTICSEARCH_REFRESH_INTERVAL,
+                    "translog.flush_threshold_size": settings.ELASTICSEARCH_TRANSLOG_FLUSH_THRESHOLD,
+                }
+            }
+        )
+        logging.info("Updated Elasticsearch index settings: finance_docs")
+
+
+# 初始化 MongoDB 索引
+def init_mongodb():
+    """
+    初始化 MongoDB 索引
+    """
+    from app.db.session import mongo_db
+    
+    # 按内容摘要查找已处理过的文档
+    mongo_db.documents.create_index("content_digest")
+    logging.info("Created MongoDB index: documents.content_digest")
+    
+    # 按文档ID覆盖写入文档内容
+    mongo_db.documents.create_index("document_id")
+    logging.info("Created MongoDB index: documents.document_id")
+    
+    # 训练数据缓存通过最近的写入时间判断数据是否变化
+    mongo_db.documents.create_index("updated_at")
+    logging.info("Created MongoDB index: documents.updated_at")
 
 
 def init_db(db: Session) -> None:
@@ -102,4 +136,10 @@ def init_db(db: Session) -> None:
         logging.error(f"Failed to initialize Elasticsearch: {e}")
         logging.warning("Elasticsearch initialization skipped. Some search features may not work properly.")
     
+    # 初始化 MongoDB
+    try:
+        init_mongodb()
+    except Exception as e:
+        logging.error(f"Failed to initialize MongoDB: {e}")
+    
     logging.info("Database initialization complete") 
\ No newline at end of file
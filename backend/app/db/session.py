@@ -1,10 +1,18 @@
+from typing import Optional
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
+engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URI,
+    pool_pre_ping=True,
+    pool_size=settings.SQLALCHEMY_POOL_SIZE,
+    max_overflow=settings.SQLALCHEMY_MAX_OVERFLOW,
+    pool_recycle=settings.SQLALCHEMY_POOL_RECYCLE,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -12,34 +20,60 @@ Base = declarative_base()
 # MongoDB连接
 from pymongo import MongoClient
 
-mongo_client = MongoClient(settings.MONGODB_URL)
+# connect=False：首次操作时才建立连接，导入模块不会访问网络
+mongo_client = MongoClient(
+    settings.MONGODB_URL,
+    maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+    minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+    connect=False,
+)
 mongo_db = mongo_client.get_database()
 
 # Elasticsearch连接
 from elasticsearch import Elasticsearch
 
-es_client = Elasticsearch(settings.ELASTICSEARCH_URL)
+es_client = Elasticsearch(
+    settings.ELASTICSEARCH_URL,
+    http_compress=True,
+    connections_per_node=settings.ELASTICSEARCH_CONNECTIONS_PER_NODE,
+)
 
 # Redis连接
 import redis
 
-redis_client = redis.Redis.from_url(settings.REDIS_URL)
+# 所有请求共享同一个有上限的连接池；连接用尽时等待空闲连接，而不是立即抛出ConnectionError
+redis_pool = redis.BlockingConnectionPool.from_url(
+    settings.REDIS_URL,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_POOL_TIMEOUT,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+)
+redis_client = redis.Redis(connection_pool=redis_pool)
 
 # RabbitMQ连接
 import pika
 
-def get_rabbitmq_connection():
-    """获取RabbitMQ连接"""
+def get_rabbitmq_connection(timeout: Optional[float] = None):
+    """获取RabbitMQ连接，timeout限制建立连接的各个阶段（秒），默认使用pika的设置"""
     parameters = pika.URLParameters(settings.RABBITMQ_URL)
+    if timeout is not None:
+        parameters.connection_attempts = 1
+        parameters.socket_timeout = timeout
+        parameters.stack_timeout = timeout
     return pika.BlockingConnection(parameters)
 
 
 def get_db():
     """
-    获取数据库会话
+    获取数据库会话，每个请求一个事务：正常结束时提交，出错时回滚
     """
     db = SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close() 
\ No newline at end of file
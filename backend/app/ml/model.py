@@ -1,36 +1,80 @@
 import os
+import hashlib
 import pickle
 import logging
 import json
 import time
+import threading
 from typing import List, Dict, Any, Tuple, Optional, Union, Callable
+import msgpack
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
 from sklearn.naive_bayes import MultinomialNB
-from sklearn.svm import SVC
+from sklearn.svm import LinearSVC
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.linear_model import SGDClassifier
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split, GridSearchCV
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 from sklearn.pipeline import Pipeline
-from joblib import Memory, Parallel, delayed
+import joblib
+from joblib import Parallel, delayed
 import redis
 from functools import lru_cache
 
 from app.core.config import settings
+from app.db.session import redis_client
 
 
-# 初始化Redis连接（用于模型预测缓存）
+# 文本摘要，用于生成跨进程稳定的缓存键
 try:
-    redis_client = redis.from_url(settings.REDIS_URL)
-    REDIS_AVAILABLE = True
-except:
-    REDIS_AVAILABLE = False
-    logging.warning("Redis连接失败，将使用本地缓存")
+    from blake3 import blake3 as _blake3
+
+    def text_digest(text: str) -> str:
+        """计算文本的128位摘要（BLAKE3）"""
+        return _blake3(text.encode('utf-8')).hexdigest(16)
+except ImportError:
+    def text_digest(text: str) -> str:
+        """计算文本的128位摘要（未安装blake3时使用BLAKE2b）"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+# 当前模型版本
+MODEL_VERSION = "0.1.0"
+
+# 哈希特征空间大小
+HASHING_N_FEATURES = 2 ** 18
+
+# 训练或预测的文本超过该数量时分片并行进行特征提取
+PARALLEL_FEATURES_MIN_TEXTS = 10000
+
+# 可能存在的模型文件扩展名，按加载优先级排列
+MODEL_FILE_EXTENSIONS = (".npz", ".joblib", ".pkl")
+
+# 推理只依赖这些数组的模型，保存为.npz而不是序列化整个估计器
+ARRAY_MODEL_ATTRS = {
+    "naive_bayes": ("feature_log_prob_", "class_log_prior_"),
+    "sgd": ("coef_", "intercept_"),
+}
+
+# 训练后转换为float32的线性模型参数
+FLOAT32_MODEL_ATTRS = ("coef_", "intercept_", "feature_log_prob_", "class_log_prior_")
+
+
+def build_vectorizer(n_features: int = HASHING_N_FEATURES, ngram_range: Tuple[int, int] = (1, 2)) -> Pipeline:
+    """
+    创建特征提取管道
+
+    使用HashingVectorizer代替TfidfVectorizer，无需保存词表，模型文件和内存占用更小
+    """
+    return Pipeline([
+        ('hash', HashingVectorizer(
+            n_features=n_features, alternate_sign=False, norm=None, ngram_range=ngram_range,
+            dtype=np.float32
+        )),
+        ('tfidf', TfidfTransformer())
+    ])
 
-# 配置joblib缓存
-cache_dir = os.path.join(os.path.dirname(__file__), "cache")
-os.makedirs(cache_dir, exist_ok=True)
-memory = Memory(cache_dir, verbose=0)
 
 
 class DocumentClassifier:
@@ -41,56 +85,76 @@ class DocumentClassifier:
         初始化文档分类器
         
         参数:
-            model_type: 模型类型，可选 "naive_bayes", "svm", "random_forest"
+            model_type: 模型类型，可选 "naive_bayes", "svm", "sgd", "random_forest"
             cache_ttl: 缓存有效期（秒）
         """
         self.model_type = model_type
-        self.vectorizer = TfidfVectorizer(max_features=5000)
+        self.vectorizer = build_vectorizer()
         self.cache_ttl = cache_ttl
         
         if model_type == "naive_bayes":
             self.model = MultinomialNB()
         elif model_type == "svm":
-            self.model = SVC(kernel='linear', probability=True)
+            # liblinear训练复杂度与样本数线性相关，概率通过交叉验证校准得到
+            self.model = CalibratedClassifierCV(LinearSVC(C=1.0, dual='auto'), cv=3)
+        elif model_type == "sgd":
+            self.model = SGDClassifier(loss='log_loss', n_jobs=-1)
         elif model_type == "random_forest":
-            self.model = RandomForestClassifier(n_estimators=100)
+            self.model = RandomForestClassifier(n_estimators=100, n_jobs=-1)
         else:
             raise ValueError(f"Unsupported model type: {model_type}")
         
         self.classes = []
-        self.version = "0.1.0"
+        self._classes_arr = np.asarray(self.classes)
+        self.version = MODEL_VERSION
         self.metadata = {
             "model_type": model_type,
             "version": self.version,
             "trained_at": None,
             "performance": {}
         }
-        
-        # 检查是否有预训练模型
-        self._try_load_pretrained()
     
-    def _try_load_pretrained(self):
-        """尝试加载预训练模型"""
-        try:
-            default_path = os.path.join(settings.MODEL_PATH, f"{self.model_type}_{self.version}")
-            if os.path.exists(f"{default_path}.pkl"):
-                self.load(default_path)
-                logging.info(f"已加载预训练模型: {default_path}")
-        except Exception as e:
-            logging.warning(f"加载预训练模型失败: {e}")
+    def _to_float32(self) -> None:
+        """
+        将线性模型参数从float64转换为float32，稀疏矩阵乘法的内存带宽减半
+
+        只处理实例上保存的数组，随机森林、校准分类器等没有这些参数的模型不受影响
+        """
+        for attr in FLOAT32_MODEL_ATTRS:
+            value = vars(self.model).get(attr)
+            if isinstance(value, np.ndarray) and value.dtype == np.float64:
+                setattr(self.model, attr, value.astype(np.float32))
     
-    @memory.cache
     def _process_text_batch(self, texts: List[str]) -> np.ndarray:
-        """处理文本批次，进行特征提取（带缓存）"""
+        """处理文本批次，进行特征提取"""
         return self.vectorizer.transform(texts)
     
+    def _fit_transform_features(self, texts: List[str], n_shards: int = 8):
+        """
+        拟合特征提取管道并转换训练文本
+
+        HashingVectorizer无状态，大语料分片并行哈希后合并，只有TF-IDF权重需要在全量数据上拟合
+        """
+        if len(texts) < PARALLEL_FEATURES_MIN_TEXTS:
+            return self.vectorizer.fit_transform(texts)
+        
+        hashing = self.vectorizer.named_steps['hash']
+        shard_size = (len(texts) + n_shards - 1) // n_shards
+        shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+        counts = sparse.vstack(
+            Parallel(n_jobs=-1, backend='loky')(delayed(hashing.transform)(shard) for shard in shards),
+            format='csr'
+        )
+        return self.vectorizer.named_steps['tfidf'].fit_transform(counts)
+    
     def _parallel_process_texts(self, texts: List[str], batch_size: int = 100) -> List[np.ndarray]:
         """并行处理多批次文本"""
         n_batches = (len(texts) + batch_size - 1) // batch_size
         batches = [texts[i*batch_size:(i+1)*batch_size] for i in range(n_batches)]
         
+        # 只把特征提取管道发送给子进程，而不是序列化整个分类器
         results = Parallel(n_jobs=-1)(
-            delayed(self._process_text_batch)(batch) for batch in batches
+            delayed(self.vectorizer.transform)(batch) for batch in batches
         )
         
         return results
@@ -117,15 +181,17 @@ class DocumentClassifier:
         # 创建处理管道
         if not use_hyperparameter_tuning:
             # 特征提取
-            X_train_tfidf = self.vectorizer.fit_transform(X_train)
+            X_train_tfidf = self._fit_transform_features(X_train)
             X_test_tfidf = self.vectorizer.transform(X_test)
             
             # 训练模型
             self.model.fit(X_train_tfidf, y_train)
+            self._to_float32()
         else:
             # 使用网格搜索进行超参数调优
             pipeline = Pipeline([
-                ('tfidf', TfidfVectorizer()),
+                ('hash', HashingVectorizer(alternate_sign=False, norm=None, dtype=np.float32)),
+                ('tfidf', TfidfTransformer()),
                 ('classifier', self._get_model_for_tuning())
             ])
             
@@ -133,13 +199,16 @@ class DocumentClassifier:
             param_grid = self._get_param_grid()
             
             # 执行网格搜索
-            grid_search = GridSearchCV(pipeline, param_grid, cv=5, n_jobs=-1, verbose=1)
+            grid_search = GridSearchCV(
+                pipeline, param_grid, cv=5, n_jobs=-1, pre_dispatch='2*n_jobs', verbose=1
+            )
             grid_search.fit(X_train, y_train)
             
             # 获取最佳模型
             best_params = grid_search.best_params_
-            self.vectorizer = grid_search.best_estimator_.named_steps['tfidf']
+            self.vectorizer = grid_search.best_estimator_[:-1]
             self.model = grid_search.best_estimator_.named_steps['classifier']
+            self._to_float32()
             
             # 评估
             X_test_tfidf = self.vectorizer.transform(X_test)
@@ -154,8 +223,9 @@ class DocumentClassifier:
             y_test, y_pred, average='weighted'
         )
         
-        # 存储类别
-        self.classes = list(set(labels))
+        # 存储类别，顺序与predict_proba的列顺序一致
+        self.classes = self.model.classes_.tolist()
+        self._classes_arr = np.asarray(self.classes)
         
         # 计算训练时间
         training_time = time.time() - start_time
@@ -180,9 +250,11 @@ class DocumentClassifier:
         if self.model_type == "naive_bayes":
             return MultinomialNB()
         elif self.model_type == "svm":
-            return SVC(probability=True)
+            return CalibratedClassifierCV(LinearSVC(dual='auto'), cv=3)
+        elif self.model_type == "sgd":
+            return SGDClassifier(loss='log_loss', n_jobs=-1)
         elif self.model_type == "random_forest":
-            return RandomForestClassifier()
+            return RandomForestClassifier(n_jobs=-1)
         else:
             raise ValueError(f"Unsupported model type: {self.model_type}")
     
@@ -190,21 +262,26 @@ class DocumentClassifier:
         """获取超参数网格"""
         if self.model_type == "naive_bayes":
             return {
-                'tfidf__max_features': [1000, 3000, 5000],
-                'tfidf__ngram_range': [(1, 1), (1, 2)],
+                'hash__n_features': [2 ** 16, 2 ** 18],
+                'hash__ngram_range': [(1, 1), (1, 2)],
                 'classifier__alpha': [0.1, 0.5, 1.0]
             }
         elif self.model_type == "svm":
             return {
-                'tfidf__max_features': [3000, 5000],
-                'tfidf__ngram_range': [(1, 1), (1, 2)],
-                'classifier__C': [0.1, 1.0, 10.0],
-                'classifier__kernel': ['linear', 'rbf']
+                'hash__n_features': [2 ** 16, 2 ** 18],
+                'hash__ngram_range': [(1, 1), (1, 2)],
+                'classifier__estimator__C': [0.1, 1.0, 10.0]
+            }
+        elif self.model_type == "sgd":
+            return {
+                'hash__n_features': [2 ** 16, 2 ** 18],
+                'hash__ngram_range': [(1, 1), (1, 2)],
+                'classifier__alpha': [1e-5, 1e-4, 1e-3]
             }
         elif self.model_type == "random_forest":
             return {
-                'tfidf__max_features': [3000, 5000],
-                'tfidf__ngram_range': [(1, 1), (1, 2)],
+                'hash__n_features': [2 ** 16, 2 ** 18],
+                'hash__ngram_range': [(1, 1), (1, 2)],
                 'classifier__n_estimators': [50, 100],
                 'classifier__max_depth': [None, 10, 20]
             }
@@ -224,32 +301,49 @@ class DocumentClassifier:
         if not hasattr(self, 'model') or self.model is None:
             raise ValueError("Model not trained or loaded")
         
-        # 并行处理文本
-        batch_size = min(100, len(texts))
-        processed_batches = self._parallel_process_texts(texts, batch_size)
+        if not texts:
+            return []
+        
+        # 一次MGET取回所有已缓存的结果，只对未命中的文本运行模型
+        keys = [self._cache_key(text) for text in texts]
+        results = self._mget_from_cache(keys)
+        
+        # 同一批次中重复的未命中文本只预测一次
+        misses: Dict[str, List[int]] = {}
+        for i, result in enumerate(results):
+            if result is None:
+                misses.setdefault(keys[i], []).append(i)
+        
+        if misses:
+            miss_predictions = self._predict_uncached([texts[idx[0]] for idx in misses.values()])
+            for idx, prediction in zip(misses.values(), miss_predictions):
+                for i in idx:
+                    results[i] = prediction
+            self._mset_to_cache(list(zip(misses.keys(), miss_predictions)))
         
-        # 合并处理结果
-        if len(processed_batches) == 1:
-            text_features = processed_batches[0]
+        return results
+    
+    def _predict_uncached(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """对一批文本运行特征提取和模型预测，不经过缓存"""
+        if len(texts) < PARALLEL_FEATURES_MIN_TEXTS:
+            # worker的批次等常见的小批量直接在当前进程中提取特征，避免启动并行任务的开销
+            text_features = self.vectorizer.transform(texts)
         else:
-            text_features = np.vstack([batch for batch in processed_batches])
+            # 大批量文本分批并行处理后合并
+            processed_batches = self._parallel_process_texts(texts, batch_size=1000)
+            text_features = sparse.vstack(processed_batches, format='csr')
         
-        # 预测
-        predictions = []
+        # 预测（向量化取每行的最大概率及对应类别）
         if hasattr(self.model, 'predict_proba'):
             probas = self.model.predict_proba(text_features)
-            for i, proba in enumerate(probas):
-                class_idx = np.argmax(proba)
-                confidence = proba[class_idx]
-                predicted_class = self.classes[class_idx]
-                predictions.append((predicted_class, float(confidence)))
-        else:
-            class_indices = self.model.predict(text_features)
-            for class_idx in class_indices:
-                predicted_class = self.classes[class_idx]
-                predictions.append((predicted_class, 0.8))  # 默认置信度
-        
-        return predictions
+            class_idx = probas.argmax(axis=1)
+            confidences = probas[np.arange(len(probas)), class_idx]
+            predicted = self._classes_arr[class_idx]
+            return list(zip(predicted.tolist(), confidences.astype(float).tolist()))
+        
+        # 不支持概率输出的模型直接返回类别标签，使用默认置信度
+        predicted = self.model.predict(text_features)
+        return [(predicted_class, 0.8) for predicted_class in predicted.tolist()]
     
     def predict(self, text: str) -> Tuple[str, float]:
         """
@@ -265,7 +359,7 @@ class DocumentClassifier:
             raise ValueError("Model not trained or loaded")
         
         # 尝试从缓存获取结果
-        cache_key = f"model:{self.model_type}:{self.version}:{hash(text)}"
+        cache_key = self._cache_key(text)
         cached_result = self._get_from_cache(cache_key)
         
         if cached_result:
@@ -301,23 +395,55 @@ class DocumentClassifier:
         
         return result
     
+    def _cache_key(self, text: str) -> str:
+        """
+        生成预测结果的缓存键
+
+        不能使用hash(text)：其值随进程随机化，且64位哈希冲突会返回错误的类别
+        """
+        return f"model:{self.model_type}:{self.version}:{text_digest(text)}"
+    
+    @staticmethod
+    def _decode_cached(cached: Optional[bytes]) -> Optional[Tuple[str, float]]:
+        """解码缓存中的预测结果"""
+        if not cached:
+            return None
+        try:
+            predicted_class, confidence = msgpack.unpackb(cached)
+            return predicted_class, confidence
+        except Exception:
+            return None
+    
     def _get_from_cache(self, key: str) -> Optional[Tuple[str, float]]:
         """从缓存获取预测结果"""
-        if REDIS_AVAILABLE:
-            cached = redis_client.get(key)
-            if cached:
-                try:
-                    return pickle.loads(cached)
-                except:
-                    pass
-        return None
+        try:
+            return self._decode_cached(redis_client.get(key))
+        except redis.RedisError:
+            return None
     
     def _save_to_cache(self, key: str, result: Tuple[str, float]) -> None:
         """保存预测结果到缓存"""
-        if REDIS_AVAILABLE:
+        try:
+            redis_client.setex(key, self.cache_ttl, msgpack.packb(result))
+        except redis.RedisError:
+            pass
+    
+    def _mget_from_cache(self, keys: List[str]) -> List[Optional[Tuple[str, float]]]:
+        """一次请求批量获取预测结果，未命中的位置为None"""
+        try:
+            return [self._decode_cached(cached) for cached in redis_client.mget(keys)]
+        except redis.RedisError:
+            return [None] * len(keys)
+    
+    def _mset_to_cache(self, items: List[Tuple[str, Tuple[str, float]]]) -> None:
+        """通过管道批量保存预测结果"""
+        if items:
             try:
-                redis_client.setex(key, self.cache_ttl, pickle.dumps(result))
-            except:
+                pipe = redis_client.pipeline(transaction=False)
+                for key, result in items:
+                    pipe.setex(key, self.cache_ttl, msgpack.packb(result))
+                pipe.execute()
+            except redis.RedisError:
                 pass
     
     def save(self, model_path: Optional[str] = None) -> str:
@@ -335,14 +461,17 @@ class DocumentClassifier:
         
         os.makedirs(os.path.dirname(model_path), exist_ok=True)
         
-        # 保存模型和向量化器
-        with open(f"{model_path}.pkl", 'wb') as f:
-            pickle.dump({
+        if self.model_type in ARRAY_MODEL_ATTRS:
+            self._save_arrays(model_path)
+        else:
+            # 保存模型和向量化器
+            # 不压缩：压缩文件无法内存映射加载
+            joblib.dump({
                 'model': self.model,
                 'vectorizer': self.vectorizer,
                 'classes': self.classes,
                 'metadata': self.metadata
-            }, f)
+            }, f"{model_path}.joblib")
         
         # 保存元数据为JSON
         with open(f"{model_path}_metadata.json", 'w') as f:
@@ -350,6 +479,47 @@ class DocumentClassifier:
         
         return model_path
     
+    def _save_arrays(self, model_path: str) -> None:
+        """将模型参数、IDF权重和哈希参数保存为.npz，与scikit-learn版本无关"""
+        hashing = self.vectorizer.named_steps['hash']
+        arrays = {attr: getattr(self.model, attr) for attr in ARRAY_MODEL_ATTRS[self.model_type]}
+        np.savez(
+            f"{model_path}.npz",
+            classes=self.model.classes_,
+            idf=self.vectorizer.named_steps['tfidf'].idf_,
+            n_features=np.asarray(hashing.n_features),
+            ngram_range=np.asarray(hashing.ngram_range),
+            **arrays
+        )
+    
+    @classmethod
+    def _load_arrays(cls, model_path: str) -> 'DocumentClassifier':
+        """从.npz重建估计器和特征提取管道"""
+        with open(f"{model_path}_metadata.json") as f:
+            metadata = json.load(f)
+        
+        with np.load(f"{model_path}.npz", allow_pickle=False) as data:
+            classifier = cls(model_type=metadata['model_type'])
+            for attr in ARRAY_MODEL_ATTRS[classifier.model_type]:
+                setattr(classifier.model, attr, data[attr])
+            classifier.model.classes_ = data['classes']
+            classifier.model.n_features_in_ = int(data['n_features'])
+            
+            classifier.vectorizer = build_vectorizer(
+                n_features=int(data['n_features']),
+                ngram_range=tuple(int(n) for n in data['ngram_range'])
+            )
+            tfidf = classifier.vectorizer.named_steps['tfidf']
+            tfidf.idf_ = data['idf']
+            # idf_的setter总是以float64重建对角矩阵，转换回float32，否则transform输出float64矩阵
+            tfidf._idf_diag = tfidf._idf_diag.astype(np.float32)
+            classifier.classes = data['classes'].tolist()
+        
+        classifier._classes_arr = np.asarray(classifier.classes)
+        classifier.metadata = metadata
+        classifier.version = metadata['version']
+        return classifier
+    
     @classmethod
     def load(cls, model_path: str) -> 'DocumentClassifier':
         """
@@ -362,14 +532,23 @@ class DocumentClassifier:
             加载的DocumentClassifier实例
         """
         try:
-            with open(f"{model_path}.pkl", 'rb') as f:
-                data = pickle.load(f)
+            if os.path.exists(f"{model_path}.npz"):
+                return cls._load_arrays(model_path)
+            
+            if os.path.exists(f"{model_path}.joblib"):
+                # 内存映射加载，模型中的NumPy数组由各worker进程通过页缓存共享
+                data = joblib.load(f"{model_path}.joblib", mmap_mode='r')
+            else:
+                # 兼容旧版本保存的pickle模型
+                with open(f"{model_path}.pkl", 'rb') as f:
+                    data = pickle.load(f)
             
             model_type = data['metadata']['model_type']
             classifier = cls(model_type=model_type)
             classifier.model = data['model']
             classifier.vectorizer = data['vectorizer']
             classifier.classes = data['classes']
+            classifier._classes_arr = np.asarray(classifier.classes)
             classifier.metadata = data['metadata']
             classifier.version = data['metadata']['version']
             
@@ -377,4 +556,80 @@ class DocumentClassifier:
         
         except Exception as e:
             logging.error(f"Error loading model: {e}")
-            raise 
\ No newline at end of file
+            raise 
+
+
+@lru_cache(maxsize=4)
+def get_classifier(model_type: str = "naive_bayes") -> DocumentClassifier:
+    """
+    获取共享的分类器实例，每个进程每种模型类型只从磁盘加载一次
+
+    参数:
+        model_type: 模型类型
+
+    返回:
+        已加载预训练模型的DocumentClassifier实例；没有预训练模型时返回未训练的实例
+    """
+    default_path = os.path.join(settings.MODEL_PATH, f"{model_type}_{MODEL_VERSION}")
+    if any(os.path.exists(f"{default_path}{ext}") for ext in MODEL_FILE_EXTENSIONS):
+        try:
+            classifier = DocumentClassifier.load(default_path)
+            logging.info(f"已加载预训练模型: {default_path}")
+            return classifier
+        except Exception as e:
+            logging.warning(f"加载预训练模型失败: {e}")
+    return DocumentClassifier(model_type=model_type)
+
+
+class ModelReloader(threading.Thread):
+    """
+    后台模型重载线程
+
+    定期检查模型文件的修改时间，有新模型时在后台加载完成后整体替换classifier引用。
+    引用赋值是原子操作，读取方无需加锁，也不会读到新旧混合的模型状态
+    """
+
+    def __init__(self, model_type: str = "naive_bayes", interval: float = settings.MODEL_RELOAD_INTERVAL):
+        super().__init__(name=f"model-reloader-{model_type}", daemon=True)
+        self.model_path = os.path.join(settings.MODEL_PATH, f"{model_type}_{MODEL_VERSION}")
+        self.interval = interval
+        self._mtime = self._model_mtime()
+        self._stop_event = threading.Event()
+        self.classifier = get_classifier(model_type)
+
+    def _model_mtime(self) -> Optional[float]:
+        """模型文件和元数据文件中最新的修改时间，模型不存在时返回None"""
+        paths = [f"{self.model_path}{ext}" for ext in MODEL_FILE_EXTENSIONS]
+        paths.append(f"{self.model_path}_metadata.json")
+        mtimes = [os.path.getmtime(path) for path in paths if os.path.exists(path)]
+        return max(mtimes) if mtimes else None
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            mtime = self._model_mtime()
+            if mtime is None or mtime == self._mtime:
+                continue
+            try:
+                classifier = DocumentClassifier.load(self.model_path)
+            except Exception as e:
+                # 文件可能仍在写入，下个周期重试
+                logging.warning(f"重新加载模型失败: {e}")
+                continue
+            self._mtime = mtime
+            self.classifier = classifier
+            logging.info(f"已重新加载模型: {self.model_path}")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+@lru_cache(maxsize=4)
+def get_model_reloader(model_type: str = "naive_bayes") -> ModelReloader:
+    """
+    获取并启动每个进程每种模型类型唯一的模型重载线程
+
+    需要随模型更新的调用方应读取 get_model_reloader().classifier，而不是长期持有分类器实例
+    """
+    reloader = ModelReloader(model_type)
+    reloader.start()
+    return reloader
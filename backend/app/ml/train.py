@@ -2,31 +2,75 @@ import os
 import argparse
 import logging
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
 from datetime import datetime
+from joblib import Memory
 
+from app.core.config import settings
 from app.db.session import SessionLocal, mongo_db
-from app.ml.model import DocumentClassifier
+from app.ml.model import DocumentClassifier, text_digest
 
+# 训练数据磁盘缓存，重复训练时无需再次从MongoDB读取
+training_data_cache = Memory(os.path.join(settings.MODEL_PATH, "cache"), verbose=0)
 
-def load_training_data_from_mongodb() -> tuple:
+
+def _read_training_data_from_mongodb() -> tuple:
+    """以游标流式读取已分类的文档"""
+    texts = []
+    labels = []
+    # 服务端完成过滤和字段投影，只传输正文和类别
+    cursor = mongo_db.documents.aggregate(
+        [
+            {"$match": {"metadata.category": {"$exists": True}}},
+            {"$project": {"_id": 0, "text": "$content", "label": "$metadata.category"}},
+        ],
+        batchSize=1000,
+        allowDiskUse=True,
+    )
+    for doc in cursor:
+        texts.append(doc["text"])
+        labels.append(doc["label"])
+    return texts, labels
+
+
+@training_data_cache.cache
+def _fetch_training_data_from_mongodb(
+    document_count: int, latest_id: Optional[str], latest_update: Optional[str]
+) -> tuple:
+    """
+    带磁盘缓存地读取已分类的文档
+
+    参数只用作缓存键：集合有新增或删除文档（document_count、latest_id），
+    或已有文档被重新处理后覆盖写入（latest_update）时缓存失效
+    """
+    return _read_training_data_from_mongodb()
+
+
+def load_training_data_from_mongodb(use_cache: bool = True) -> tuple:
     """
     从MongoDB加载训练数据
     
+    参数:
+        use_cache: 是否使用磁盘缓存；直接修改过MongoDB中的数据时可关闭
+    
     返回:
         元组(texts, labels)
     """
     logging.info("Loading training data from MongoDB...")
     
-    # 从MongoDB获取所有已分类的文档
-    documents = list(mongo_db.documents.find(
-        {"metadata.category": {"$exists": True}},
-        {"content": 1, "metadata.category": 1}
-    ))
-    
-    texts = [doc["content"] for doc in documents]
-    labels = [doc["metadata"]["category"] for doc in documents]
+    if use_cache:
+        # 以文档数、最新文档ID和最近写入时间作为集合的廉价校验值（均走索引或集合元数据）
+        document_count = mongo_db.documents.estimated_document_count()
+        latest = mongo_db.documents.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        latest_id = str(latest["_id"]) if latest else None
+        updated = mongo_db.documents.find_one(
+            {"updated_at": {"$exists": True}}, {"_id": 0, "updated_at": 1}, sort=[("updated_at", -1)]
+        )
+        latest_update = updated["updated_at"].isoformat() if updated else None
+        texts, labels = _fetch_training_data_from_mongodb(document_count, latest_id, latest_update)
+    else:
+        texts, labels = _read_training_data_from_mongodb()
     
     logging.info(f"Loaded {len(texts)} documents with {len(set(labels))} unique categories")
     return texts, labels
@@ -44,10 +88,16 @@ def load_training_data_from_csv(csv_path: str) -> tuple:
     """
     logging.info(f"Loading training data from CSV: {csv_path}")
     
-    df = pd.read_csv(csv_path)
-    if "text" not in df.columns or "category" not in df.columns:
+    # 先只读取表头检查列名，解析错误不会被误报为缺少列
+    columns = pd.read_csv(csv_path, nrows=0).columns
+    if "text" not in columns or "category" not in columns:
         raise ValueError("CSV must contain 'text' and 'category' columns")
     
+    # PyArrow解析器多线程读取，列保持为Arrow字符串数组
+    df = pd.read_csv(
+        csv_path, usecols=["text", "category"], engine="pyarrow", dtype_backend="pyarrow"
+    )
+    
     texts = df["text"].tolist()
     labels = df["category"].tolist()
     
@@ -55,24 +105,51 @@ def load_training_data_from_csv(csv_path: str) -> tuple:
     return texts, labels
 
 
-def train_model(model_type: str, data_source: str, output_path: str = None) -> DocumentClassifier:
+def deduplicate_training_data(texts: List[str], labels: List[str]) -> tuple:
+    """
+    按文本内容摘要去重，重复文本只保留第一次出现的样本
+    
+    返回:
+        元组(texts, labels)
+    """
+    seen = set()
+    unique_texts = []
+    unique_labels = []
+    for text, label in zip(texts, labels):
+        digest = text_digest(text)
+        if digest in seen:
+            continue
+        seen.add(digest)
+        unique_texts.append(text)
+        unique_labels.append(label)
+    
+    logging.info(f"Removed {len(texts) - len(unique_texts)} duplicate documents")
+    return unique_texts, unique_labels
+
+
+def train_model(
+    model_type: str, data_source: str, output_path: str = None, use_cache: bool = True
+) -> DocumentClassifier:
     """
     训练文档分类模型
     
     参数:
-        model_type: 模型类型，可选 "naive_bayes", "svm", "random_forest"
+        model_type: 模型类型，可选 "naive_bayes", "svm", "sgd", "random_forest"
         data_source: 数据源，"mongodb" 或 CSV文件路径
         output_path: 模型输出路径
+        use_cache: 从MongoDB加载时是否使用训练数据缓存
     
     返回:
         训练好的DocumentClassifier实例
     """
     # 加载训练数据
     if data_source == "mongodb":
-        texts, labels = load_training_data_from_mongodb()
+        texts, labels = load_training_data_from_mongodb(use_cache=use_cache)
     else:
         texts, labels = load_training_data_from_csv(data_source)
     
+    texts, labels = deduplicate_training_data(texts, labels)
+    
     # 检查数据
     if len(texts) < 10:
         logging.warning("Very small training dataset. Model may not perform well.")
@@ -110,7 +187,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Train document classification model")
     parser.add_argument(
         "--model", type=str, default="naive_bayes",
-        choices=["naive_bayes", "svm", "random_forest"],
+        choices=["naive_bayes", "svm", "sgd", "random_forest"],
         help="Model type to train"
     )
     parser.add_argument(
@@ -122,7 +199,12 @@ if __name__ == "__main__":
         help="Output path for the trained model"
     )
     
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Read training data from MongoDB without the on-disk cache"
+    )
+    
     args = parser.parse_args()
     
     # 训练模型
-    train_model(args.model, args.data, args.output) 
\ No newline at end of file
+    train_model(args.model, args.data, args.output, use_cache=not args.no_cache) 
\ No newline at end of file
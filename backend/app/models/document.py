@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Enum, Float
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Enum, Float, Index
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -16,7 +16,11 @@ class DocumentUpload(Base):
     file_size = Column(Integer, nullable=False)  # 以字节为单位
     upload_path = Column(String, nullable=False)
     uploader_id = Column(Integer, ForeignKey("users.id"))
-    upload_time = Column(DateTime, default=datetime.utcnow)
+    upload_time = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    __table_args__ = (
+        Index("ix_documents_file_type_upload_time", file_type, upload_time.desc()),
+    )
     
     # 关系
     uploader = relationship("User", back_populates="document_uploads")
@@ -28,8 +32,8 @@ class DocumentClassification(Base):
     __tablename__ = "document_classifications"
 
     id = Column(Integer, primary_key=True, index=True)
-    document_id = Column(Integer, ForeignKey("document_uploads.id"))
-    category = Column(String, nullable=False)
+    document_id = Column(Integer, ForeignKey("document_uploads.id"), index=True)
+    category = Column(String, nullable=False, index=True)
     confidence = Column(Float, nullable=False)
     classified_at = Column(DateTime, default=datetime.utcnow)
     model_version = Column(String, nullable=False)
@@ -51,5 +55,12 @@ class AuditLog(Base):
     ip_address = Column(String, nullable=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        # 覆盖 CRUDAuditLog 中按时间倒序分页的查询
+        Index("ix_auditlog_user_ts", user_id, timestamp.desc()),
+        Index("ix_auditlog_action_ts", action, timestamp.desc()),
+        Index("ix_auditlog_timestamp", timestamp.desc()),
+    )
+    
     # 关系
     user = relationship("User") 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, Enum
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -15,8 +15,13 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     role = Column(Enum("admin", "analyst", "viewer", name="user_role"), default="viewer")
     is_active = Column(Boolean(), default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # 部分索引，同时覆盖按角色和活跃状态的筛选
+        Index("ix_users_role", role, postgresql_where=is_active),
+    )
+
     # 关系
     document_uploads = relationship("DocumentUpload", back_populates="uploader") 
\ No newline at end of file
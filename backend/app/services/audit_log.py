@@ -1,7 +1,106 @@
-from typing import Optional
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 
 from app import crud, schemas
+from app.db.session import SessionLocal
+from app.models.document import AuditLog
+
+# 队列中的停止标记
+_STOP = object()
+
+
+class AuditLogBuffer:
+    """
+    审计日志写入缓冲区
+
+    请求路径只负责入队，由后台任务按批量（条数或时间间隔）写入数据库
+    """
+
+    def __init__(self, maxsize: int = 10000, batch_size: int = 100, flush_interval: float = 5.0):
+        self.session_factory = SessionLocal
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """在事件循环中启动后台刷新任务"""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._task = self._loop.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """停止后台任务，队列中剩余的日志全部写入后返回"""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    def put(self, entry: Dict[str, Any]) -> None:
+        """将一条日志加入队列，可在任意线程中调用"""
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._put(entry)
+        else:
+            self._loop.call_soon_threadsafe(self._put, entry)
+
+    def _put(self, entry: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            # 队列已满时不丢弃日志，直接单独写入
+            logging.warning("Audit log queue full, writing entry directly")
+            self._loop.create_task(asyncio.to_thread(self._write, [entry]))
+
+    async def _flush_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            entry = await self._queue.get()
+            if entry is _STOP:
+                break
+            batch = [entry]
+            deadline = self._loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            await asyncio.to_thread(self._write, batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        db = self.session_factory()
+        try:
+            db.bulk_insert_mappings(AuditLog, batch)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logging.error(f"Error writing {len(batch)} audit log entries: {e}")
+        finally:
+            db.close()
+
+
+# 每200条或每0.5秒写入一次，进程崩溃时最多丢失半秒内的日志
+audit_log_buffer = AuditLogBuffer(batch_size=200, flush_interval=0.5)
 
 
 def log_user_action(
@@ -15,7 +114,9 @@ def log_user_action(
 ) -> None:
     """
     记录用户操作的审计日志
-    
+
+    后台缓冲区运行时日志异步批量写入，否则（如worker进程）直接写入数据库
+
     参数:
         db: 数据库会话
         user_id: 用户ID
@@ -33,5 +134,11 @@ def log_user_action(
         details=details,
         ip_address=ip_address
     )
-    
-    crud.audit_log.create(db, obj_in=log_in) 
\ No newline at end of file
+
+    if audit_log_buffer.running:
+        entry = log_in.dict()
+        # 以入队时间作为日志时间，而不是写入时间
+        entry["timestamp"] = datetime.utcnow()
+        audit_log_buffer.put(entry)
+    else:
+        crud.audit_log.create(db, obj_in=log_in)
@@ -0,0 +1,94 @@
+import atexit
+import logging
+import threading
+from typing import Any, Callable, List, Optional
+
+
+class BulkBuffer:
+    """
+    批量写入缓冲区（线程版，用于worker等同步代码）
+
+    append只负责加入缓冲区，条数达到batch_size或每隔flush_interval秒由后台线程调用flush_func批量写入。
+    后台线程和进程退出时的写入失败只记录日志；需要确认写入结果的调用方先取checkpoint()，
+    再调用flush(since=...)，期间任何一次写入失败（包括后台线程的写入）都会抛出异常
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush_func: Callable[[List[Any]], None],
+        batch_size: int = 100,
+        flush_interval: float = 2.0,
+    ):
+        self.name = name
+        self.flush_func = flush_func
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._items: List[Any] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # 写入失败的次数，用于判断某个检查点之后加入的数据是否全部写入成功
+        self._failures = 0
+
+    def append(self, item: Any) -> None:
+        """加入一条待写入的数据，首次调用时启动后台刷新线程"""
+        with self._lock:
+            self._items.append(item)
+            full = len(self._items) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"bulk-buffer-{self.name}", daemon=True
+                )
+                self._thread.start()
+                # 进程退出前写入剩余数据
+                atexit.register(self.close)
+        if full:
+            self._wakeup.set()
+
+    def checkpoint(self) -> int:
+        """返回当前的写入失败次数，作为flush(since=...)的参数"""
+        with self._lock:
+            return self._failures
+
+    def flush(self, since: Optional[int] = None) -> None:
+        """
+        立即写入缓冲区中的全部数据，返回时之前加入的数据都已写入
+
+        写入失败时抛出异常；传入since时，检查点之后的任何一次写入失败也会抛出异常，
+        因为这段时间加入的数据可能已被后台线程或其他调用方取走写入
+        """
+        with self._flush_lock:
+            with self._lock:
+                items, self._items = self._items, []
+            if items:
+                try:
+                    self.flush_func(items)
+                except Exception:
+                    with self._lock:
+                        self._failures += 1
+                    raise
+            if since is not None and self.checkpoint() != since:
+                raise RuntimeError(f"Failed to flush buffered items to {self.name}")
+
+    def _flush_and_log(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            logging.error(f"Error flushing items to {self.name}: {e}")
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._flush_and_log()
+
+    def close(self) -> None:
+        """停止后台线程并写入剩余数据"""
+        self._closed.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._flush_and_log()
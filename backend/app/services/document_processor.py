@@ -1,62 +1,116 @@
 import os
 import io
+import re
+import threading
 import json
 import logging
-from typing import Dict, List, Any, Tuple, Optional
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Any, Tuple, Optional
 
-import PyPDF2
+import fitz
+from elasticsearch.helpers import bulk, parallel_bulk
 from docx import Document
-from bs4 import BeautifulSoup
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+from lxml import etree
+from pymongo import ReplaceOne
 import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
-import numpy as np
 
 from app import crud, schemas
 from app.core.config import settings
 from app.db.session import mongo_db, es_client
+from app.ml.model import MODEL_VERSION, get_model_reloader, text_digest
+from app.services.bulk_buffer import BulkBuffer
+from app.services.pdf_pages import extract_pdf_pages
 
-# 初始化NLTK资源
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# 预处理只用到分词结果和词表中的is_stop/is_punct属性，不加载其余管道组件
+# 如需句子边界，应添加sentencizer而不是保留parser
+SPACY_EXCLUDE = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
 
+# 加载spaCy模型，模型在构建镜像时安装，运行时不再下载
 try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-# 加载spaCy模型
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    logging.warning("spaCy model not found. Downloading...")
-    spacy.cli.download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+    nlp = spacy.load("en_core_web_sm", exclude=SPACY_EXCLUDE)
+except OSError as e:
+    raise RuntimeError(
+        "spaCy model en_core_web_sm is not installed; run `python -m spacy download en_core_web_sm`"
+    ) from e
 
 # 中文支持
 try:
-    nlp_zh = spacy.load("zh_core_web_sm")
+    nlp_zh = spacy.load("zh_core_web_sm", exclude=SPACY_EXCLUDE)
 except OSError:
     logging.warning("spaCy Chinese model not found. Using English model instead.")
     nlp_zh = nlp
 
-# 停用词
-stop_words_en = set(stopwords.words('english'))
+# 尚无训练好的模型时使用的类别
+UNCLASSIFIED_CATEGORY = "未分类"
+
+# 汉字匹配，search在C中找到第一个汉字即返回
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+
+# 批量预处理时每批送入spaCy的文档数，也是worker一次预取的消息数
+PREPROCESS_BATCH_SIZE = 16
+
+# 页数不超过该值的PDF在读取页数时直接在进程内提取，省去子进程的往返和再次解析
+PDF_INPROCESS_MAX_PAGES = 3
+
+# 页数达到该值的PDF按页范围分给多个子进程并行提取，其余的由一个子进程整体提取
+PDF_PARALLEL_MIN_PAGES = 8
+
+# PDF提取进程数，最多4个，避免与RabbitMQ消费者争抢CPU
+PDF_MAX_WORKERS = min(os.cpu_count() or 1, 4)
+
+# PDF提取进程池，首次使用时创建
+_pdf_executor: Optional[ProcessPoolExecutor] = None
+
+
+_fitz_lock = threading.Lock()
+_nlp_lock = threading.Lock()
+
+# 批量处理时并行提取文本的线程池，文件读取和PDF进程池的等待可以互相重叠
+_extract_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_extract_executor() -> ThreadPoolExecutor:
+    global _extract_executor
+    if _extract_executor is None:
+        _extract_executor = ThreadPoolExecutor(max_workers=PDF_MAX_WORKERS, thread_name_prefix="extract")
+    return _extract_executor
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    global _pdf_executor
+    if _pdf_executor is None:
+        # 进程池可能在任意线程中首次创建，此时其他线程可能持有锁（spaCy、PyMuPDF、pika、logging），
+        # fork出的子进程会继承这些已锁住的锁而死锁，因此使用spawn启动子进程
+        _pdf_executor = ProcessPoolExecutor(
+            max_workers=PDF_MAX_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pdf_executor
 
 
 def extract_text_from_pdf(file_path: str) -> str:
-    """从PDF文件中提取文本"""
+    """从PDF文件中提取文本（PyMuPDF）"""
     text = ""
     try:
-        with open(file_path, 'rb') as f:
-            pdf_reader = PyPDF2.PdfReader(f)
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text()
+        # PyMuPDF不支持多线程并发使用，进程内的调用通过锁串行；
+        # 只有几页的PDF直接在锁内提取，其余交给进程池，批量处理时可以在不同子进程中并行
+        with _fitz_lock, fitz.open(file_path) as doc:
+            page_count = len(doc)
+            if page_count <= PDF_INPROCESS_MAX_PAGES:
+                return "\n".join(page.get_text("text") for page in doc)
+        
+        # 页数较少的PDF由一个子进程整体提取；页数较多时每个子进程处理一段连续页面，只需打开一次文件
+        executor = _get_pdf_executor()
+        if page_count < PDF_PARALLEL_MIN_PAGES:
+            step = page_count
+        else:
+            step = -(-page_count // PDF_MAX_WORKERS)
+        futures = [
+            executor.submit(extract_pdf_pages, file_path, start, min(start + step, page_count))
+            for start in range(0, page_count, step)
+        ]
+        text = "\n".join(future.result() for future in futures)
     except Exception as e:
         logging.error(f"Error extracting text from PDF: {e}")
     return text
@@ -67,8 +121,7 @@ def extract_text_from_docx(file_path: str) -> str:
     text = ""
     try:
         doc = Document(file_path)
-        for para in doc.paragraphs:
-            text += para.text + "\n"
+        text = "".join(para.text + "\n" for para in doc.paragraphs)
     except Exception as e:
         logging.error(f"Error extracting text from DOCX: {e}")
     return text
@@ -78,39 +131,84 @@ def extract_text_from_html(file_path: str) -> str:
     """从HTML文件中提取文本"""
     text = ""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # lxml直接从文件读取并解析，不在Python中生成整个文件的字符串
+        # 与原先一致按UTF-8解码：未声明charset时lxml会按latin-1解析，中文会变成乱码
+        parser = etree.HTMLParser(encoding="utf-8", remove_comments=True)
+        tree = etree.parse(file_path, parser)
         # 移除脚本和样式元素
-        for script in soup(["script", "style"]):
-            script.extract()
-        text = soup.get_text()
+        etree.strip_elements(tree, "script", "style", with_tail=False)
+        text = " ".join(tree.getroot().itertext())
     except Exception as e:
         logging.error(f"Error extracting text from HTML: {e}")
     return text
 
 
-def preprocess_text(text: str, language: str = "en") -> str:
-    """文本预处理：分词、去除停用词等"""
-    if not text:
-        return ""
-    
-    # 简单的语言检测
-    if any('\u4e00' <= char <= '\u9fff' for char in text):
-        language = "zh"
-    
+def _detect_language(text: str, language: str) -> str:
+    """简单的语言检测：包含汉字即按中文处理"""
+    if _CJK_RE.search(text):
+        return "zh"
+    return language
+
+
+def preprocess_doc(doc, language: str) -> str:
+    """将spaCy分词结果转换为去除停用词后的文本"""
     if language == "zh":
         # 中文处理
-        doc = nlp_zh(text)
         tokens = [token.text for token in doc if not token.is_stop and not token.is_punct]
     else:
-        # 英文处理
-        tokens = word_tokenize(text.lower())
-        tokens = [word for word in tokens if word.isalnum() and word not in stop_words_en]
-    
+        # 英文处理：文本已统一转为小写；先用词表标志过滤停用词，每个词只取一次token.text
+        isalnum = str.isalnum
+        words = (token.text for token in doc if not token.is_stop)
+        tokens = [word for word in words if isalnum(word)]
     return " ".join(tokens)
 
 
+def preprocess_texts(texts: List[str], language: str = "en") -> List[str]:
+    """
+    批量文本预处理：按语言分组，每组一次通过nlp.pipe分词
+
+    返回与texts顺序一致的预处理结果
+    """
+    results = [""] * len(texts)
+    groups: Dict[str, List[int]] = {}
+    for i, text in enumerate(texts):
+        if text:
+            groups.setdefault(_detect_language(text, language), []).append(i)
+    
+    for lang, indices in groups.items():
+        # spaCy管道不保证线程安全，worker并发处理多个批次时串行分词
+        with _nlp_lock:
+            if lang == "zh":
+                docs = nlp_zh.pipe((texts[i] for i in indices), batch_size=PREPROCESS_BATCH_SIZE)
+            else:
+                docs = nlp.pipe((texts[i].lower() for i in indices), batch_size=PREPROCESS_BATCH_SIZE)
+            for i, doc in zip(indices, docs):
+                results[i] = preprocess_doc(doc, lang)
+    
+    return results
+
+
+def preprocess_text(text: str, language: str = "en") -> str:
+    """文本预处理：分词、去除停用词等"""
+    return preprocess_texts([text], language)[0]
+
+
+def classify_documents(texts: List[str]) -> List[Tuple[str, float]]:
+    """
+    使用预训练模型批量分类文档
+    
+    整批文本一次完成特征提取和预测；模型由后台线程热更新，每批读取一次当前模型
+    
+    返回：
+        元组（类别，置信度）的列表
+    """
+    classifier = get_model_reloader().classifier
+    if not classifier.classes:
+        logging.warning("No trained model available, documents left unclassified")
+        return [(UNCLASSIFIED_CATEGORY, 0.0)] * len(texts)
+    return classifier.predict_batch(texts)
+
+
 def classify_document(text: str, file_type: str) -> Tuple[str, float]:
     """
     使用预训练模型对文档进行分类
@@ -118,132 +216,332 @@ def classify_document(text: str, file_type: str) -> Tuple[str, float]:
     返回：
         元组（类别，置信度）
     """
-    # TODO: 实现实际的分类逻辑，目前返回模拟数据
-    
-    # 模拟金融文档类别
-    categories = [
-        "财务报告", 
-        "投资分析", 
-        "风险评估", 
-        "市场研究", 
-        "监管合规", 
-        "贷款申请",
-        "保险合同",
-        "审计报告"
-    ]
-    
-    # 在实际应用中，这里应该加载模型并进行预测
-    # 目前仅返回随机类别和置信度作为示例
-    import random
-    category = random.choice(categories)
-    confidence = random.uniform(0.7, 0.99)
-    
-    return category, confidence
+    return classify_documents([text])[0]
 
 
-def store_document_content(document_id: int, text: str, metadata: Dict[str, Any]) -> None:
+def _flush_mongo_documents(documents: List[Dict[str, Any]]) -> None:
+    """
+    通过一次bulk_write写入缓冲的文档，单条失败不影响其余文档
+
+    按document_id覆盖写入，消息重新投递后再次处理同一文档不会产生重复记录
+    """
+    mongo_db.documents.bulk_write(
+        [ReplaceOne({"document_id": doc["document_id"]}, doc, upsert=True) for doc in documents],
+        ordered=False
+    )
+
+
+# MongoDB写入缓冲区，每100个文档或每2秒批量写入一次
+mongo_bulk_buffer = BulkBuffer("mongodb", _flush_mongo_documents, batch_size=100, flush_interval=2.0)
+
+
+def store_document_content(
+    document_id: int,
+    text: str,
+    metadata: Dict[str, Any],
+    processed_text: Optional[str] = None,
+    content_digest: Optional[str] = None,
+) -> None:
     """
     将文档内容存储到MongoDB
+
+    原文只保存在MongoDB；同时保存预处理结果和内容摘要，内容相同的文档再次上传时直接复用。
+    只加入批量缓冲区；需要确认写入完成时调用 mongo_bulk_buffer.flush()
     """
-    mongo_db.documents.insert_one({
+    mongo_bulk_buffer.append({
         "document_id": document_id,
         "content": text,
+        "processed_content": processed_text,
+        "content_digest": content_digest,
+        "model_version": MODEL_VERSION,
         "metadata": metadata,
-        "created_at": metadata.get("upload_time")
+        "created_at": metadata.get("upload_time"),
+        # 每次写入（包括重新处理后覆盖写入）都会更新，训练数据缓存据此判断数据是否变化
+        "updated_at": datetime.utcnow()
     })
 
 
-def index_document(document_id: int, text: str, metadata: Dict[str, Any]) -> None:
+def find_processed_contents(digests: List[str]) -> Dict[str, Tuple[str, Tuple[str, float]]]:
     """
-    将文档索引到Elasticsearch
+    查找内容摘要相同、已由当前模型版本分类的文档
+
+    返回:
+        内容摘要到 (预处理文本, (类别, 置信度)) 的映射
     """
-    try:
-        es_client.index(
-            index="finance_docs",
-            id=document_id,
-            body={
-                "content": text,
-                "filename": metadata.get("filename"),
-                "uploader_id": metadata.get("uploader_id"),
-                "upload_time": metadata.get("upload_time"),
-                "file_type": metadata.get("file_type"),
-                "category": metadata.get("category"),
-                "confidence": metadata.get("confidence")
-            }
+    if not digests:
+        return {}
+    cursor = mongo_db.documents.find(
+        {
+            "content_digest": {"$in": list(set(digests))},
+            "model_version": MODEL_VERSION,
+            "metadata.category": {"$ne": UNCLASSIFIED_CATEGORY},
+        },
+        {"_id": 0, "content_digest": 1, "processed_content": 1, "metadata.category": 1, "metadata.confidence": 1}
+    )
+    return {
+        doc["content_digest"]: (
+            doc["processed_content"],
+            (doc["metadata"]["category"], doc["metadata"]["confidence"])
         )
-    except Exception as e:
-        logging.error(f"Error indexing document in Elasticsearch: {e}")
+        for doc in cursor
+    }
 
 
-def process_document(document_id: int, file_path: str, file_type: str, db) -> Dict[str, Any]:
+def _index_body(text: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """构建文档的Elasticsearch索引内容"""
+    return {
+        "content": text,
+        "filename": metadata.get("filename"),
+        "uploader_id": metadata.get("uploader_id"),
+        "upload_time": metadata.get("upload_time"),
+        "file_type": metadata.get("file_type"),
+        "category": metadata.get("category"),
+        "confidence": metadata.get("confidence")
+    }
+
+
+def _flush_index_actions(actions: List[Dict[str, Any]]) -> None:
+    """通过一次bulk请求写入缓冲的索引操作，任一文档索引失败时抛出异常"""
+    _, errors = bulk(es_client, actions, raise_on_error=False)
+    for error in errors:
+        logging.error(f"Error indexing document in Elasticsearch: {error}")
+    if errors:
+        raise RuntimeError(f"Failed to index {len(errors)} of {len(actions)} documents in Elasticsearch")
+
+
+# Elasticsearch索引缓冲区，每100个文档或每2秒发送一次bulk请求
+es_bulk_buffer = BulkBuffer("elasticsearch", _flush_index_actions, batch_size=100, flush_interval=2.0)
+
+
+def index_document(document_id: int, text: str, metadata: Dict[str, Any]) -> None:
     """
-    处理上传的文档
-    
-    步骤:
-    1. 根据文件类型提取文本
-    2. 预处理文本
-    3. 使用模型分类文档
-    4. 将分类结果存入数据库
-    5. 将文档内容存入MongoDB
-    6. 将文档索引到Elasticsearch
+    将文档索引到Elasticsearch
+
+    只加入批量缓冲区；需要确认写入完成时调用 es_bulk_buffer.flush()
     """
-    # 获取文档记录
-    document = crud.document.get(db, id=document_id)
-    if not document:
-        logging.error(f"Document with ID {document_id} not found")
-        return {"success": False, "error": "Document not found"}
-    
-    # 提取文本
-    if file_type == "pdf":
-        text = extract_text_from_pdf(file_path)
-    elif file_type == "docx":
-        text = extract_text_from_docx(file_path)
-    elif file_type == "html":
-        text = extract_text_from_html(file_path)
-    else:
-        return {"success": False, "error": "Unsupported file type"}
-    
-    if not text:
-        return {"success": False, "error": "Failed to extract text from document"}
-    
-    # 预处理文本
-    processed_text = preprocess_text(text)
+    es_bulk_buffer.append({
+        "_op_type": "index",
+        "_index": "finance_docs",
+        "_id": document_id,
+        "_source": _index_body(text, metadata)
+    })
+
+
+def bulk_index_documents(documents: Iterable[Tuple[int, str, Dict[str, Any]]]) -> int:
+    """
+    批量将文档索引到Elasticsearch
+
+    写入期间关闭索引刷新，结束后恢复配置的刷新间隔
     
-    # 分类文档
-    category, confidence = classify_document(processed_text, file_type)
+    参数:
+        documents: (document_id, text, metadata) 元组的可迭代对象
     
-    # 创建分类记录
-    classification_in = schemas.DocumentClassificationCreate(
-        category=category,
-        confidence=confidence,
-        model_version="0.1.0"  # 当前模型版本
+    返回:
+        成功索引的文档数
+    """
+    actions = (
+        {
+            "_index": "finance_docs",
+            "_id": document_id,
+            "_source": _index_body(text, metadata)
+        }
+        for document_id, text, metadata in documents
     )
     
-    # 存储分类结果
-    classification = crud.document_classification.create_with_document(
-        db, obj_in=classification_in, document_id=document_id
+    indexed = 0
+    es_client.indices.put_settings(
+        index="finance_docs", body={"index": {"refresh_interval": "-1"}}
     )
+    try:
+        for ok, item in parallel_bulk(
+            es_client,
+            actions,
+            thread_count=os.cpu_count() or 4,
+            chunk_size=500,
+            max_chunk_bytes=50 * 1024 * 1024,
+            queue_size=4,
+            raise_on_error=False,
+        ):
+            if ok:
+                indexed += 1
+            else:
+                logging.error(f"Error bulk indexing document in Elasticsearch: {item}")
+    finally:
+        es_client.indices.put_settings(
+            index="finance_docs",
+            body={"index": {"refresh_interval": settings.ELASTICSEARCH_REFRESH_INTERVAL}}
+        )
     
-    # 准备元数据
-    metadata = {
-        "document_id": document_id,
+    return indexed
+
+
+# 文件类型对应的文本提取函数，支持新类型只需在此注册
+EXTRACTORS: Dict[str, Callable[[str], str]] = {
+    "pdf": extract_text_from_pdf,
+    "docx": extract_text_from_docx,
+    "html": extract_text_from_html,
+}
+
+
+def extract_text(file_path: str, file_type: str) -> Optional[str]:
+    """根据文件类型提取文本，不支持的类型返回None"""
+    extractor = EXTRACTORS.get(file_type)
+    if extractor is None:
+        return None
+    return extractor(file_path)
+
+
+def _document_fields(document) -> Dict[str, Any]:
+    """读取写入MongoDB和Elasticsearch所需的文档字段"""
+    return {
+        "document_id": document.id,
         "filename": document.filename,
         "file_type": document.file_type,
         "uploader_id": document.uploader_id,
         "upload_time": document.upload_time.isoformat(),
+    }
+
+
+def _store_results(
+    fields: Dict[str, Any], text: str, processed_text: str, content_digest: str, prediction: Tuple[str, float]
+) -> Dict[str, Any]:
+    """将单个文档的内容写入MongoDB和Elasticsearch，分类记录已由process_documents整批写入"""
+    document_id = fields["document_id"]
+    category, confidence = prediction
+    
+    # 准备元数据
+    metadata = {
+        **fields,
         "category": category,
         "confidence": confidence
     }
     
     # 存储文档内容到MongoDB
-    store_document_content(document_id, text, metadata)
+    store_document_content(
+        document_id, text, metadata, processed_text=processed_text, content_digest=content_digest
+    )
     
-    # 索引文档到Elasticsearch
-    index_document(document_id, text, metadata)
+    # 索引预处理后的文本到Elasticsearch，原文不重复存储
+    index_document(document_id, processed_text, metadata)
     
     return {
         "success": True,
         "document_id": document_id,
         "category": category,
         "confidence": confidence
-    } 
\ No newline at end of file
+    }
+
+
+def process_documents(jobs: List[Tuple[int, str, str]], db) -> List[Dict[str, Any]]:
+    """
+    批量处理上传的文档
+    
+    步骤:
+    1. 根据文件类型提取文本
+    2. 所有文档一起预处理文本（spaCy批量分词），内容已处理过的文档直接复用结果
+    3. 使用模型分类文档
+    4. 将分类结果存入数据库
+    5. 将文档内容存入MongoDB
+    6. 将文档索引到Elasticsearch
+    
+    参数:
+        jobs: (document_id, file_path, file_type) 元组列表
+    
+    返回:
+        与jobs顺序一致的处理结果列表
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    pending = []
+    found = []
+    
+    for i, (document_id, file_path, file_type) in enumerate(jobs):
+        # 获取文档记录
+        document = crud.document.get(db, id=document_id)
+        if not document:
+            logging.error(f"Document with ID {document_id} not found")
+            results[i] = {"success": False, "error": "Document not found"}
+            continue
+        found.append((i, document, file_path, file_type))
+    
+    # 提取文本：多个文档在线程池中并行提取
+    if len(found) > 1:
+        texts = list(_get_extract_executor().map(
+            lambda job: extract_text(job[2], job[3]), found
+        ))
+    else:
+        texts = [extract_text(file_path, file_type) for _, _, file_path, file_type in found]
+    
+    for (i, document, _, _), text in zip(found, texts):
+        if text is None:
+            results[i] = {"success": False, "error": "Unsupported file type"}
+        elif not text:
+            results[i] = {"success": False, "error": "Failed to extract text from document"}
+        else:
+            pending.append((i, document, text))
+    
+    # 内容相同的文档已处理过时，直接复用预处理结果和分类结果
+    digests = [text_digest(text) for _, _, text in pending]
+    known = find_processed_contents(digests)
+    processed_texts: List[Optional[str]] = [None] * len(pending)
+    predictions: List[Optional[Tuple[str, float]]] = [None] * len(pending)
+    new_indices = []
+    for j, digest in enumerate(digests):
+        if digest in known:
+            processed_texts[j], predictions[j] = known[digest]
+        else:
+            new_indices.append(j)
+    
+    if new_indices:
+        # 预处理文本
+        new_processed = preprocess_texts([pending[j][2] for j in new_indices])
+        
+        # 分类文档
+        new_predictions = classify_documents(new_processed)
+        for j, processed_text, prediction in zip(new_indices, new_processed, new_predictions):
+            processed_texts[j] = processed_text
+            predictions[j] = prediction
+    
+    if not pending:
+        return results
+    
+    # 提交前读取文档字段：提交后ORM对象过期，再次访问属性会逐个文档查询数据库
+    document_fields = [_document_fields(document) for _, document, _ in pending]
+    
+    # 存储分类结果：整批分类记录一次写入并提交；
+    # 同一事务中先删除当前模型版本已有的分类记录，消息重新投递时不会重复插入
+    document_ids = [fields["document_id"] for fields in document_fields]
+    try:
+        crud.document_classification.remove_by_documents(
+            db, document_ids=document_ids, model_version=MODEL_VERSION
+        )
+        crud.document_classification.create_many(
+            db,
+            objs_in=[
+                schemas.DocumentClassificationCreate(
+                    category=category,
+                    confidence=confidence,
+                    model_version=MODEL_VERSION  # 当前模型版本
+                )
+                for category, confidence in predictions
+            ],
+            document_ids=document_ids,
+        )
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Error storing classifications for {len(pending)} documents: {e}")
+        for i, _, _ in pending:
+            # 数据库暂时不可用等错误，重新投递后可能成功
+            results[i] = {"success": False, "error": str(e), "retry": True}
+        return results
+    
+    for (i, _, text), fields, processed_text, digest, prediction in zip(
+        pending, document_fields, processed_texts, digests, predictions
+    ):
+        results[i] = _store_results(fields, text, processed_text, digest, prediction)
+    
+    return results
+
+
+def process_document(document_id: int, file_path: str, file_type: str, db) -> Dict[str, Any]:
+    """处理单个上传的文档，步骤见process_documents"""
+    return process_documents([(document_id, file_path, file_type)], db)[0]
@@ -0,0 +1,12 @@
+import fitz
+
+
+def extract_pdf_pages(file_path: str, start: int, stop: int) -> str:
+    """
+    提取PDF第start到stop-1页的文本
+
+    在PDF提取进程池的子进程中运行；子进程以spawn方式启动并导入本模块，
+    因此这里只依赖PyMuPDF，不导入spaCy模型和数据库连接
+    """
+    with fitz.open(file_path) as doc:
+        return "\n".join(doc[i].get_text("text") for i in range(start, stop))
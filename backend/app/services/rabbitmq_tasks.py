@@ -1,9 +1,74 @@
+import asyncio
+import atexit
 import json
 import logging
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, List
 
+import aio_pika
+import pika
+from aio_pika.abc import AbstractIncomingMessage
+
+from app.core.config import settings
 from app.db.session import get_rabbitmq_connection, SessionLocal
-from app.services.document_processor import process_document
+from app.services.document_processor import (
+    PREPROCESS_BATCH_SIZE, es_bulk_buffer, mongo_bulk_buffer, process_document, process_documents
+)
+
+# 发布消息用的长连接，进程内共享；BlockingConnection不是线程安全的，通过锁串行使用
+_publish_lock = threading.Lock()
+_publish_connection = None
+_publish_channel = None
+
+# 未凑满一批时，最多等待该秒数后处理已收到的消息
+BATCH_WAIT_TIMEOUT = 1.0
+
+
+def _get_publish_channel():
+    """获取发布消息用的长连接通道，首次调用或连接断开后重新建立并声明队列"""
+    global _publish_connection, _publish_channel
+    if _publish_connection is None or _publish_connection.is_closed or not _publish_channel.is_open:
+        _close_publish_connection()
+        _publish_connection = get_rabbitmq_connection()
+        _publish_channel = _publish_connection.channel()
+        _publish_channel.queue_declare(queue='document_processing', durable=True)
+    return _publish_channel
+
+
+def _close_publish_connection() -> None:
+    global _publish_connection, _publish_channel
+    if _publish_connection is not None and _publish_connection.is_open:
+        try:
+            _publish_connection.close()
+        except pika.exceptions.AMQPError:
+            pass
+    _publish_connection = None
+    _publish_channel = None
+
+
+def _close_publish_connection_at_exit() -> None:
+    with _publish_lock:
+        _close_publish_connection()
+
+
+atexit.register(_close_publish_connection_at_exit)
+
+
+def _publish(message: Dict[str, Any]) -> None:
+    """发布消息；空闲期间连接可能已被服务器断开，失败时重连后重试一次"""
+    body = json.dumps(message)
+    # 持久化消息，确保消息不会在RabbitMQ重启时丢失
+    properties = pika.BasicProperties(delivery_mode=2)
+    with _publish_lock:
+        try:
+            _get_publish_channel().basic_publish(
+                exchange='', routing_key='document_processing', body=body, properties=properties
+            )
+        except pika.exceptions.AMQPError:
+            _close_publish_connection()
+            _get_publish_channel().basic_publish(
+                exchange='', routing_key='document_processing', body=body, properties=properties
+            )
 
 
 def submit_document_for_processing(document_id: int, file_path: str, file_type: str) -> None:
@@ -11,13 +76,6 @@ def submit_document_for_processing(document_id: int, file_path: str, file_type:
     将文档提交到RabbitMQ队列进行异步处理
     """
     try:
-        # 建立RabbitMQ连接
-        connection = get_rabbitmq_connection()
-        channel = connection.channel()
-        
-        # 声明队列
-        channel.queue_declare(queue='document_processing', durable=True)
-        
         # 准备消息
         message = {
             'document_id': document_id,
@@ -26,21 +84,10 @@ def submit_document_for_processing(document_id: int, file_path: str, file_type:
         }
         
         # 发布消息
-        channel.basic_publish(
-            exchange='',
-            routing_key='document_processing',
-            body=json.dumps(message),
-            properties=channel.basic_publish_pika_properties(
-                # 持久化消息，确保消息不会在RabbitMQ重启时丢失
-                delivery_mode=2  
-            )
-        )
+        _publish(message)
         
         logging.info(f"Document {document_id} submitted for processing")
         
-        # 关闭连接
-        connection.close()
-        
     except Exception as e:
         logging.error(f"Error submitting document to processing queue: {e}")
         # 如果RabbitMQ不可用，回退到直接处理
@@ -52,50 +99,144 @@ def submit_document_for_processing(document_id: int, file_path: str, file_type:
             db.close()
 
 
-def setup_document_processor() -> None:
+def _run_batch(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """在线程池中处理一批消息，返回时结果已全部写入"""
+    for message in messages:
+        logging.info(f"Processing document {message['document_id']}")
+    
+    jobs = [
+        (message['document_id'], message['file_path'], message['file_type'])
+        for message in messages
+    ]
+    # 本批次的文档内容可能被后台线程或其他批次一起写入，以检查点判断是否全部写入成功
+    mongo_checkpoint = mongo_bulk_buffer.checkpoint()
+    es_checkpoint = es_bulk_buffer.checkpoint()
+    db = SessionLocal()
+    try:
+        results = process_documents(jobs, db)
+    finally:
+        db.close()
+    
+    # 确认消息前先写入本批次缓冲的文档内容和索引操作，写入失败时抛出异常，整批退回队列
+    mongo_bulk_buffer.flush(since=mongo_checkpoint)
+    es_bulk_buffer.flush(since=es_checkpoint)
+    return results
+
+
+def _decode_message(incoming: AbstractIncomingMessage) -> Dict[str, Any]:
+    """解析消息内容，格式不正确时抛出ValueError"""
+    message = json.loads(incoming.body)
+    if not isinstance(message, dict) or not {'document_id', 'file_path', 'file_type'} <= message.keys():
+        raise ValueError("Message must contain document_id, file_path and file_type")
+    return message
+
+
+async def _handle_batch(batch: List[AbstractIncomingMessage]) -> None:
     """
-    设置文档处理器作为RabbitMQ消费者
+    处理一批消息，每条消息在其结果写入后确认
+
+    格式错误的消息直接拒绝，不再投递；可重试的失败退回队列。
+    分类记录和文档内容按文档ID覆盖写入，消息重新投递后再次处理不会产生重复数据
     """
+    valid = []
+    messages = []
+    for incoming in batch:
+        try:
+            message = _decode_message(incoming)
+        except ValueError as e:
+            logging.error(f"Rejecting malformed message: {e}")
+            await incoming.reject(requeue=False)
+            continue
+        valid.append(incoming)
+        messages.append(message)
+    if not messages:
+        return
+    
     try:
-        # 建立RabbitMQ连接
-        connection = get_rabbitmq_connection()
-        channel = connection.channel()
+        results = await asyncio.to_thread(_run_batch, messages)
+    except Exception as e:
+        # 数据库等不可用时整批退回队列，稍后重新投递
+        logging.error(f"Error processing batch of {len(valid)} documents: {e}")
+        for incoming in valid:
+            await incoming.nack(requeue=True)
+        return
+    
+    for incoming, message, result in zip(valid, messages, results):
+        document_id = message['document_id']
+        if result['success']:
+            logging.info(f"Document {document_id} processed successfully")
+        elif result.get('retry'):
+            logging.error(f"Failed to process document {document_id}, requeueing: {result.get('error')}")
+            await incoming.nack(requeue=True)
+            continue
+        else:
+            logging.error(f"Failed to process document {document_id}: {result.get('error')}")
         
-        # 声明队列
-        channel.queue_declare(queue='document_processing', durable=True)
+        # 确认消息已处理
+        await incoming.ack()
+
+
+def _log_batch_error(task: asyncio.Task) -> None:
+    """批次任务不会被await，未处理的异常（如确认消息时连接断开）在这里记录"""
+    if not task.cancelled() and task.exception() is not None:
+        logging.error(f"Error handling message batch: {task.exception()}")
+
+
+async def _collect_batch(incoming_queue: asyncio.Queue) -> List[AbstractIncomingMessage]:
+    """等待消息凑满一批，或第一条消息到达后等待超时"""
+    loop = asyncio.get_running_loop()
+    batch = [await incoming_queue.get()]
+    deadline = loop.time() + BATCH_WAIT_TIMEOUT
+    while len(batch) < PREPROCESS_BATCH_SIZE:
+        timeout = deadline - loop.time()
+        if timeout <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(incoming_queue.get(), timeout))
+        except asyncio.TimeoutError:
+            break
+    return batch
+
+
+async def consume_documents() -> None:
+    """
+    以asyncio运行文档处理器，作为RabbitMQ消费者
+
+    消息由aio-pika接收，阻塞的文档处理在线程池中执行；连接断开后自动重连。
+    最多同时处理WORKER_CONCURRENCY批消息，处理中的批次已满时暂停收集新批次
+    """
+    concurrency = settings.WORKER_CONCURRENCY
+    connection = await aio_pika.connect_robust(settings.RABBITMQ_URL)
+    async with connection:
+        channel = await connection.channel()
         
-        # 设置QoS，防止一次分发过多任务给一个worker
-        channel.basic_qos(prefetch_count=1)
+        # 设置QoS，为每个并发批次预取一批消息
+        await channel.set_qos(prefetch_count=PREPROCESS_BATCH_SIZE * concurrency)
         
-        # 定义回调函数来处理消息
-        def callback(ch, method, properties, body):
-            message = json.loads(body)
-            document_id = message['document_id']
-            file_path = message['file_path']
-            file_type = message['file_type']
-            
-            logging.info(f"Processing document {document_id}")
-            
-            db = SessionLocal()
-            try:
-                result = process_document(document_id, file_path, file_type, db)
-                if result['success']:
-                    logging.info(f"Document {document_id} processed successfully")
-                else:
-                    logging.error(f"Failed to process document {document_id}: {result.get('error')}")
-            finally:
-                db.close()
-            
-            # 确认消息已处理
-            ch.basic_ack(delivery_tag=method.delivery_tag)
+        # 声明队列
+        queue = await channel.declare_queue('document_processing', durable=True)
         
-        # 注册消费者
-        channel.basic_consume(queue='document_processing', on_message_callback=callback)
+        incoming_queue: asyncio.Queue = asyncio.Queue()
+        await queue.consume(incoming_queue.put)
         
         logging.info("Document processor started. Waiting for messages...")
         
-        # 开始消费消息
-        channel.start_consuming()
-        
-    except Exception as e:
-        logging.error(f"Error setting up document processor: {e}") 
\ No newline at end of file
+        # 开始消费消息：凑满一批，或等待超时后处理已收到的消息
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = set()
+        try:
+            while True:
+                await semaphore.acquire()
+                try:
+                    batch = await _collect_batch(incoming_queue)
+                except BaseException:
+                    semaphore.release()
+                    raise
+                task = asyncio.create_task(_handle_batch(batch))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                task.add_done_callback(_log_batch_error)
+                task.add_done_callback(lambda _: semaphore.release())
+        finally:
+            # 停止前等待处理中的批次完成并确认
+            await asyncio.gather(*tasks, return_exceptions=True)
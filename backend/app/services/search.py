@@ -1,12 +1,39 @@
 import logging
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from elasticsearch import Elasticsearch
 from sqlalchemy.orm import Session
 
 from app import models, schemas
+from app.core.security import ANALYST_ROLES
 from app.db.session import es_client
 
 
+# 结果中用到的文档字段，只返回这些字段而不是完整的_source
+SEARCH_SOURCE_FIELDS = ["filename", "upload_time", "category", "confidence"]
+SIMILAR_SOURCE_FIELDS = ["filename", "category"]
+
+
+@lru_cache(maxsize=1024)
+def _search_filters(category: Optional[str], uploader_id: Optional[int]) -> Tuple[Dict[str, Any], ...]:
+    """
+    构建搜索的过滤条件，相同的类别和上传者只构建一次
+
+    返回的过滤条件在请求之间共享，调用方不能修改
+    """
+    filters = []
+    
+    # 添加类别过滤
+    if category:
+        filters.append({"term": {"category": category}})
+    
+    # 添加权限过滤
+    if uploader_id is not None:
+        filters.append({"term": {"uploader_id": uploader_id}})
+    
+    return tuple(filters)
+
+
 def search_documents(
     db: Session,
     query: str,
@@ -26,7 +53,12 @@ def search_documents(
         符合条件的文档搜索结果列表
     """
     try:
-        # 构建搜索查询
+        # 非管理员和分析师只能搜索自己的文档
+        uploader_id = None
+        if current_user and current_user.role not in ANALYST_ROLES:
+            uploader_id = current_user.id
+        
+        # 构建搜索查询，只有match子句随请求变化
         search_body = {
             "query": {
                 "bool": {
@@ -37,27 +69,17 @@ def search_documents(
                             }
                         }
                     ],
-                    "filter": []
+                    "filter": list(_search_filters(category, uploader_id))
                 }
             },
             "sort": [
                 {"_score": {"order": "desc"}}
             ],
+            "_source": SEARCH_SOURCE_FIELDS,
+            "track_total_hits": False,  # 不需要精确的总命中数
             "size": 50  # 限制结果数量
         }
         
-        # 添加类别过滤
-        if category:
-            search_body["query"]["bool"]["filter"].append({
-                "term": {"category": category}
-            })
-        
-        # 添加权限过滤，非管理员和分析师只能搜索自己的文档
-        if current_user and current_user.role not in ["admin", "analyst"]:
-            search_body["query"]["bool"]["filter"].append({
-                "term": {"uploader_id": current_user.id}
-            })
-        
         # 执行搜索
         response = es_client.search(
             index="finance_docs",
@@ -98,8 +120,8 @@ def get_similar_documents(document_id: int, limit: int = 5) -> List[Dict[str, An
         相似文档列表
     """
     try:
-        # 先获取文档
-        document = es_client.get(index="finance_docs", id=document_id)
+        # 先确认文档存在
+        es_client.get(index="finance_docs", id=document_id, source=False)
         
         # 构建相似性查询
         search_body = {
@@ -113,17 +135,21 @@ def get_similar_documents(document_id: int, limit: int = 5) -> List[Dict[str, An
                         }
                     ],
                     "min_term_freq": 1,
-                    "max_query_terms": 25,
-                    "min_doc_freq": 1
+                    "max_query_terms": 15,  # 生成的布尔查询更小，每个分片查找的词项更少
+                    "min_doc_freq": 2
                 }
             },
+            "_source": SIMILAR_SOURCE_FIELDS,
+            "track_total_hits": False,
             "size": limit
         }
         
-        # 执行搜索
+        # 执行搜索：同一文档的重复查询固定路由到相同分片副本并使用分片请求缓存
         response = es_client.search(
             index="finance_docs",
-            body=search_body
+            body=search_body,
+            request_cache=True,
+            preference=f"mlt_{document_id}"
         )
         
         # 处理搜索结果
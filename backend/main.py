@@ -1,5 +1,6 @@
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 import uvicorn
 from typing import List
@@ -12,6 +13,7 @@ from fastapi.openapi.utils import get_openapi
 from app.api.routes import router as api_router
 from app.core.config import settings
 from app.core.security import SecurityHeadersMiddleware, CSRFMiddleware
+from app.services.audit_log import audit_log_buffer
 
 app = FastAPI(
     title="金融文档分类器 API",
@@ -19,7 +21,8 @@ app = FastAPI(
     version="0.1.0",
     docs_url=None,  # 禁用默认的/docs路径
     redoc_url=None,  # 禁用默认的/redoc路径
-    openapi_url="/api/openapi.json"  # API模式路径
+    openapi_url="/api/openapi.json",  # API模式路径
+    default_response_class=ORJSONResponse,  # 使用orjson序列化响应
 )
 
 # 添加CORS中间件
@@ -53,6 +56,19 @@ app.add_middleware(CSRFMiddleware)
 # 包含API路由
 app.include_router(api_router, prefix="/api")
 
+
+@app.on_event("startup")
+async def start_audit_log_buffer():
+    # 启动审计日志批量写入任务
+    audit_log_buffer.start()
+
+
+@app.on_event("shutdown")
+async def stop_audit_log_buffer():
+    # 写入剩余的审计日志
+    await audit_log_buffer.stop()
+
+
 # 自定义OpenAPI文档配置
 def custom_openapi():
     if app.openapi_schema:
@@ -1,38 +1,38 @@
-import pytest
 import os
-import tempfile
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from app import crud
-from app.models.document import DocumentUpload
-from app.schemas.document import DocumentUploadCreate
+from app.models.document import DocumentClassification, DocumentUpload
+from app.schemas.document import DocumentClassificationCreate, DocumentUploadCreate
 
 
-@pytest.fixture
-def temp_pdf_file():
-    """创建临时PDF文件用于测试"""
-    content = b"%PDF-1.4\n1 0 obj\n<<>>\nendobj\ntrailer\n<<>>\n%%EOF"
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp:
-        temp.write(content)
-        temp_path = temp.name
-    
-    yield temp_path
-    
-    # 清理临时文件
-    if os.path.exists(temp_path):
-        os.remove(temp_path)
+# 文档接口路径
+DOCUMENTS_URL = "/api/documents/"
+DELETE_BATCH_URL = f"{DOCUMENTS_URL}delete-batch"
+
+# 最小的PDF文件内容
+PDF_BYTES = b"%PDF-1.4\n1 0 obj\n<<>>\nendobj\ntrailer\n<<>>\n%%EOF"
+
 
+@pytest.fixture(scope="session")
+def temp_pdf_file(tmp_path_factory):
+    """创建整个测试会话共享的临时PDF文件，由pytest负责清理"""
+    path = tmp_path_factory.mktemp("pdfs") / "sample.pdf"
+    path.write_bytes(PDF_BYTES)
+    return str(path)
 
-def test_get_documents_empty(client: TestClient, normal_user_token_headers: dict) -> None:
+
+def test_get_documents_empty(authed_client: TestClient) -> None:
     """测试获取空文档列表"""
-    response = client.get("/api/documents/", headers=normal_user_token_headers)
+    response = authed_client.get(DOCUMENTS_URL)
     
     assert response.status_code == 200
     assert response.json() == []
 
 
-def test_get_documents(client: TestClient, db: Session, normal_user_token_headers: dict) -> None:
+def test_get_documents(authed_client: TestClient, db: Session) -> None:
     """测试获取文档列表"""
     # 创建测试文档
     document_in = DocumentUploadCreate(
@@ -45,14 +45,34 @@ def test_get_documents(client: TestClient, db: Session, normal_user_token_header
     )
     document = crud.document.create(db, obj_in=document_in)
     
-    response = client.get("/api/documents/", headers=normal_user_token_headers)
+    response = authed_client.get(DOCUMENTS_URL)
     
     assert response.status_code == 200
     assert len(response.json()) == 1
     assert response.json()[0]["filename"] == "test.pdf"
 
 
-def test_get_document_by_id(client: TestClient, db: Session, normal_user_token_headers: dict) -> None:
+def test_get_documents_created_in_bulk(authed_client: TestClient, db: Session) -> None:
+    """测试批量创建的文档出现在文档列表中"""
+    crud.document.create_many(db, objs_in=[
+        DocumentUploadCreate(
+            filename=f"bulk{i}.pdf",
+            file_type="pdf",
+            original_filename=f"bulk{i}.pdf",
+            file_size=1024,
+            upload_path=f"/tmp/bulk{i}.pdf",
+            uploader_id=2  # 普通用户ID
+        )
+        for i in range(3)
+    ])
+    
+    response = authed_client.get(DOCUMENTS_URL)
+    
+    assert response.status_code == 200
+    assert {doc["filename"] for doc in response.json()} == {"bulk0.pdf", "bulk1.pdf", "bulk2.pdf"}
+
+
+def test_get_document_by_id(authed_client: TestClient, db: Session) -> None:
     """测试通过ID获取文档"""
     # 创建测试文档
     document_in = DocumentUploadCreate(
@@ -65,21 +85,21 @@ def test_get_document_by_id(client: TestClient, db: Session, normal_user_token_h
     )
     document = crud.document.create(db, obj_in=document_in)
     
-    response = client.get(f"/api/documents/{document.id}", headers=normal_user_token_headers)
+    response = authed_client.get(f"{DOCUMENTS_URL}{document.id}")
     
     assert response.status_code == 200
     assert response.json()["filename"] == "test2.pdf"
 
 
-def test_get_nonexistent_document(client: TestClient, normal_user_token_headers: dict) -> None:
+def test_get_nonexistent_document(authed_client: TestClient) -> None:
     """测试获取不存在的文档"""
-    response = client.get("/api/documents/999", headers=normal_user_token_headers)
+    response = authed_client.get(f"{DOCUMENTS_URL}999")
     
     assert response.status_code == 404
     assert "detail" in response.json()
 
 
-def test_delete_document(client: TestClient, db: Session, normal_user_token_headers: dict) -> None:
+def test_delete_document(authed_client: TestClient, db: Session, monkeypatch) -> None:
     """测试删除文档"""
     # 创建测试文档
     document_in = DocumentUploadCreate(
@@ -92,15 +112,113 @@ def test_delete_document(client: TestClient, db: Session, normal_user_token_head
     )
     document = crud.document.create(db, obj_in=document_in)
     
-    # 创建空文件以便删除
-    with open(document.upload_path, "w") as f:
-        f.write("dummy content")
+    # 不操作真实磁盘，只记录要删除的文件
+    removed_paths = []
+    monkeypatch.setattr(os, "remove", removed_paths.append)
     
-    response = client.delete(f"/api/documents/{document.id}", headers=normal_user_token_headers)
+    response = authed_client.delete(f"{DOCUMENTS_URL}{document.id}")
     
     assert response.status_code == 200
     assert response.json()["filename"] == "to_delete.pdf"
     
     # 确认文档已从数据库删除
     deleted_doc = crud.document.get(db, id=document.id)
-    assert deleted_doc is None 
\ No newline at end of file
+    assert deleted_doc is None
+    
+    # 确认已上传的文件被删除
+    assert removed_paths == ["/tmp/to_delete.pdf"] 
+
+
+def _create_document(db: Session, filename: str, uploader_id: int = 2) -> DocumentUpload:
+    """创建测试文档，默认属于普通用户"""
+    return crud.document.create(db, obj_in=DocumentUploadCreate(
+        filename=filename,
+        file_type="pdf",
+        original_filename=filename,
+        file_size=1024,
+        upload_path=f"/tmp/{filename}",
+        uploader_id=uploader_id
+    ))
+
+
+def test_delete_documents_batch(authed_client: TestClient, db: Session, monkeypatch) -> None:
+    """测试批量删除自己的文档"""
+    documents = [_create_document(db, "batch1.pdf"), _create_document(db, "batch2.pdf")]
+    document_ids = [document.id for document in documents]
+    
+    # 不操作真实磁盘，只记录要删除的文件
+    removed_paths = []
+    monkeypatch.setattr(os, "remove", removed_paths.append)
+    
+    response = authed_client.post(DELETE_BATCH_URL, json={"document_ids": document_ids})
+    
+    assert response.status_code == 200
+    assert {doc["filename"] for doc in response.json()} == {"batch1.pdf", "batch2.pdf"}
+    
+    # 确认文档已从数据库删除
+    db.expire_all()
+    for document_id in document_ids:
+        assert crud.document.get(db, id=document_id) is None
+    
+    # 每个文件删除一次
+    assert sorted(removed_paths) == ["/tmp/batch1.pdf", "/tmp/batch2.pdf"]
+
+
+def test_delete_documents_batch_forbidden(authed_client: TestClient, db: Session, monkeypatch) -> None:
+    """测试批量删除包含他人文档时拒绝整批删除"""
+    own = _create_document(db, "own.pdf")
+    other = _create_document(db, "other.pdf", uploader_id=1)  # 管理员的文档
+    
+    removed_paths = []
+    monkeypatch.setattr(os, "remove", removed_paths.append)
+    
+    response = authed_client.post(DELETE_BATCH_URL, json={"document_ids": [own.id, other.id]})
+    
+    assert response.status_code == 403
+    
+    # 两个文档都没有被删除
+    db.expire_all()
+    assert crud.document.get(db, id=own.id) is not None
+    assert crud.document.get(db, id=other.id) is not None
+    assert removed_paths == []
+
+
+def test_delete_documents_batch_not_found(authed_client: TestClient, db: Session, monkeypatch) -> None:
+    """测试批量删除包含不存在的文档时返回404且不删除任何文档"""
+    own = _create_document(db, "exists.pdf")
+    
+    removed_paths = []
+    monkeypatch.setattr(os, "remove", removed_paths.append)
+    
+    response = authed_client.post(DELETE_BATCH_URL, json={"document_ids": [own.id, 999]})
+    
+    assert response.status_code == 404
+    assert "detail" in response.json()
+    
+    db.expire_all()
+    assert crud.document.get(db, id=own.id) is not None
+    assert removed_paths == []
+
+
+def test_delete_documents_batch_unlinks_classifications(
+    authed_client: TestClient, db: Session, monkeypatch
+) -> None:
+    """测试批量删除后分类结果保留，但不再关联到文档"""
+    document = _create_document(db, "classified.pdf")
+    classification = crud.document_classification.create_with_document(
+        db,
+        obj_in=DocumentClassificationCreate(category="财务报告", confidence=0.95, model_version="0.1.0"),
+        document_id=document.id
+    )
+    classification_id = classification.id
+    
+    monkeypatch.setattr(os, "remove", lambda path: None)
+    
+    response = authed_client.post(DELETE_BATCH_URL, json={"document_ids": [document.id]})
+    
+    assert response.status_code == 200
+    
+    db.expire_all()
+    classification = db.get(DocumentClassification, classification_id)
+    assert classification is not None
+    assert classification.document_id is None
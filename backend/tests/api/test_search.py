@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
@@ -8,52 +9,63 @@ from app.models.document import DocumentUpload, DocumentClassification
 from app.schemas.document import DocumentUploadCreate, DocumentClassificationCreate
 
 
-def test_search_documents(client: TestClient, normal_user_token_headers: dict) -> None:
+# 请求路径，中文查询参数预先做好百分号编码（"财务报告"）
+SEARCH_URL = "/api/search/?query=%E8%B4%A2%E5%8A%A1%E6%8A%A5%E5%91%8A"
+SEARCH_WITH_CATEGORY_URL = f"{SEARCH_URL}&category=%E8%B4%A2%E5%8A%A1%E6%8A%A5%E5%91%8A"
+BY_CATEGORY_URL = "/api/search/by-category?category=%E8%B4%A2%E5%8A%A1%E6%8A%A5%E5%91%8A"
+
+# search_documents的模拟返回值
+MOCK_SEARCH_HIT = [
+    {
+        "document_id": 1,
+        "score": 0.95,
+        "filename": "test.pdf",
+        "original_filename": "test.pdf",
+        "upload_time": "2023-01-01T00:00:00",
+        "category": "财务报告",
+        "confidence": 0.92
+    }
+]
+
+# 普通用户按类别查询（默认分页）时使用的缓存键
+CATEGORY_CACHE_KEY = "category:财务报告:2:0:100"
+
+# 按类别查询接口缓存在Redis中的结果
+MOCK_CATEGORY_HIT = [
+    {
+        "id": 1,
+        "filename": "cached.pdf",
+        "file_type": "pdf",
+        "original_filename": "cached.pdf",
+        "file_size": 1024,
+        "upload_path": "/tmp/cached.pdf",
+        "uploader_id": 2,
+        "upload_time": "2023-01-01T00:00:00",
+        "classifications": []
+    }
+]
+
+
+def test_search_documents(authed_client: TestClient) -> None:
     """测试搜索文档"""
     # 模拟search_documents函数的返回值
-    with patch("app.services.search.search_documents") as mock_search:
-        mock_search.return_value = [
-            {
-                "document_id": 1,
-                "score": 0.95,
-                "filename": "test.pdf",
-                "original_filename": "test.pdf",
-                "upload_time": "2023-01-01T00:00:00",
-                "category": "财务报告",
-                "confidence": 0.92
-            }
-        ]
+    with patch("app.api.endpoints.search.search_documents") as mock_search:
+        mock_search.return_value = MOCK_SEARCH_HIT
         
-        response = client.get(
-            "/api/search/?query=财务报告", 
-            headers=normal_user_token_headers
-        )
+        response = authed_client.get(SEARCH_URL)
         
         assert response.status_code == 200
         assert len(response.json()) == 1
         assert response.json()[0]["category"] == "财务报告"
 
 
-def test_search_documents_with_category(client: TestClient, normal_user_token_headers: dict) -> None:
+def test_search_documents_with_category(authed_client: TestClient) -> None:
     """测试按类别过滤搜索文档"""
     # 模拟search_documents函数的返回值
-    with patch("app.services.search.search_documents") as mock_search:
-        mock_search.return_value = [
-            {
-                "document_id": 1,
-                "score": 0.95,
-                "filename": "test.pdf",
-                "original_filename": "test.pdf",
-                "upload_time": "2023-01-01T00:00:00",
-                "category": "财务报告",
-                "confidence": 0.92
-            }
-        ]
+    with patch("app.api.endpoints.search.search_documents") as mock_search:
+        mock_search.return_value = MOCK_SEARCH_HIT
         
-        response = client.get(
-            "/api/search/?query=财务报告&category=财务报告", 
-            headers=normal_user_token_headers
-        )
+        response = authed_client.get(SEARCH_WITH_CATEGORY_URL)
         
         assert response.status_code == 200
         assert len(response.json()) == 1
@@ -64,7 +76,7 @@ def test_search_documents_with_category(client: TestClient, normal_user_token_he
         assert kwargs["category"] == "财务报告"
 
 
-def test_search_by_category(client: TestClient, db: Session, normal_user_token_headers: dict) -> None:
+def test_search_by_category(authed_client: TestClient, db: Session, fake_redis) -> None:
     """测试按类别获取文档"""
     # 创建测试文档
     document_in = DocumentUploadCreate(
@@ -87,13 +99,20 @@ def test_search_by_category(client: TestClient, db: Session, normal_user_token_h
         db, obj_in=classification_in, document_id=document.id
     )
     
-    # 模拟Redis get方法返回None，表示缓存未命中
-    with patch("app.db.session.redis_client.get", return_value=None):
-        # 模拟Redis setex方法
-        with patch("app.db.session.redis_client.setex"):
-            response = client.get(
-                "/api/search/by-category?category=财务报告", 
-                headers=normal_user_token_headers
-            )
-            
-            assert response.status_code == 200 
\ No newline at end of file
+    # 缓存未命中，查询数据库后写入缓存
+    response = authed_client.get(BY_CATEGORY_URL)
+    
+    assert response.status_code == 200
+    assert fake_redis.exists(CATEGORY_CACHE_KEY)
+
+
+def test_search_by_category_cache_hit(authed_client: TestClient, fake_redis) -> None:
+    """测试按类别获取文档命中缓存时不查询数据库"""
+    fake_redis.set(CATEGORY_CACHE_KEY, json.dumps(MOCK_CATEGORY_HIT))
+    
+    with patch.object(crud.document, "get_by_category_and_uploader") as mock_query:
+        response = authed_client.get(BY_CATEGORY_URL)
+        
+        assert response.status_code == 200
+        assert response.json()[0]["filename"] == "cached.pdf"
+        mock_query.assert_not_called()
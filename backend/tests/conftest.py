@@ -1,5 +1,6 @@
 import os
 import sys
+import fakeredis
 import pytest
 from typing import Dict, Generator
 
@@ -13,13 +14,18 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 from app.core.config import settings
 from app.db.session import Base, get_db
+from app.db import session as db_session
 from app.api.deps import get_current_admin_user, get_current_user
+from app.api.endpoints import admin, health, search
+from app.ml import model as ml_model
 from app.models.user import User
+from app.services.audit_log import audit_log_buffer
 from main import app
 
 
-# 使用内存数据库进行测试
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# 使用内存数据库进行测试，StaticPool让所有连接共享同一个内存数据库
+# pytest-xdist的每个worker是独立进程，各自持有自己的引擎和内存数据库，互不影响
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
@@ -65,13 +71,38 @@ def override_get_current_user():
 app.dependency_overrides[get_db] = override_get_db
 app.dependency_overrides[get_current_admin_user] = override_get_current_admin_user
 app.dependency_overrides[get_current_user] = override_get_current_user
+# 审计日志后台写入同样使用测试数据库
+audit_log_buffer.session_factory = TestingSessionLocal
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema() -> Generator:
+    """整个测试会话只创建一次数据库表"""
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fake_redis() -> Generator:
+    """整个测试会话共享一个fakeredis实例，替换各模块导入的redis_client"""
+    client = fakeredis.FakeRedis()
+    with pytest.MonkeyPatch.context() as mp:
+        for module in (db_session, admin, health, search, ml_model):
+            mp.setattr(module, "redis_client", client)
+        yield client
+
+
+@pytest.fixture(scope="function", autouse=True)
+def _flush_redis(fake_redis: fakeredis.FakeRedis) -> Generator:
+    """每个测试结束后清空缓存，避免测试之间互相影响"""
+    yield
+    fake_redis.flushall()
 
 
 @pytest.fixture(scope="function")
 def db() -> Generator:
-    """每个测试函数使用的数据库会话"""
-    # 创建数据库表
-    Base.metadata.create_all(bind=engine)
+    """每个测试函数使用的数据库会话，测试结束后回滚事务"""
     connection = engine.connect()
     transaction = connection.begin()
     session = TestingSessionLocal(bind=connection)
@@ -84,9 +115,9 @@ def db() -> Generator:
     connection.close()
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def client() -> Generator:
-    """测试客户端"""
+    """测试客户端，整个测试会话共享，应用启动和关闭事件只运行一次"""
     with TestClient(app) as c:
         yield c
 
@@ -97,7 +128,19 @@ def superuser_token_headers(client: TestClient) -> Dict[str, str]:
     return {"Authorization": f"Bearer {settings.SECRET_KEY}"}
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def normal_user_token_headers(client: TestClient) -> Dict[str, str]:
     """创建普通用户并获取token header"""
-    return {"Authorization": f"Bearer {settings.SECRET_KEY}_user"} 
\ No newline at end of file
+    return {"Authorization": f"Bearer {settings.SECRET_KEY}_user"}
+
+
+@pytest.fixture(scope="session")
+def authed_client(client: TestClient, normal_user_token_headers: Dict[str, str]) -> Generator:
+    """
+    预先绑定普通用户token header的测试客户端，请求时无需再逐个传入headers
+
+    依赖client保证应用启动事件已运行，这里不再进入上下文，避免重复触发启动和关闭事件
+    """
+    c = TestClient(app, headers=normal_user_token_headers)
+    yield c
+    c.close() 
\ No newline at end of file
@@ -1,13 +1,13 @@
 import pytest
 import os
 import tempfile
+
 import numpy as np
-from unittest.mock import patch, MagicMock
 
 from app.ml.model import DocumentClassifier
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_texts():
     """测试文本数据"""
     return [
@@ -23,7 +23,7 @@ def test_texts():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_labels():
     """测试标签数据"""
     return [
@@ -39,6 +39,14 @@ def test_labels():
     ]
 
 
+@pytest.fixture(scope="session")
+def trained_classifier(test_texts, test_labels):
+    """整个测试会话共享的已训练模型，只读使用"""
+    classifier = DocumentClassifier()
+    classifier.train(test_texts, test_labels)
+    return classifier
+
+
 def test_model_init():
     """测试模型初始化"""
     # 测试默认初始化
@@ -70,12 +78,9 @@ def test_model_train(test_texts, test_labels):
     assert set(classifier.classes) == {"财务报告", "合同文件", "风险评估"}
 
 
-def test_model_predict(test_texts, test_labels):
+def test_model_predict(trained_classifier):
     """测试模型预测"""
-    classifier = DocumentClassifier()
-    
-    # 先训练模型
-    classifier.train(test_texts, test_labels)
+    classifier = trained_classifier
     
     # 测试已知类别的文本预测
     test_text = "这是一份新的财务报表，展示了公司的收入情况"
@@ -86,23 +91,18 @@ def test_model_predict(test_texts, test_labels):
     assert 0 <= confidence <= 1
 
 
-def test_model_save_load():
+def test_model_save_load(trained_classifier):
     """测试模型保存和加载"""
     # 创建临时目录用于保存模型
     with tempfile.TemporaryDirectory() as temp_dir:
-        # 创建并训练模型
-        classifier = DocumentClassifier()
-        classifier.train(
-            ["财务报告内容", "合同文件内容", "风险评估内容"],
-            ["财务报告", "合同文件", "风险评估"]
-        )
+        classifier = trained_classifier
         
         # 保存模型
         model_path = os.path.join(temp_dir, "test_model")
         saved_path = classifier.save(model_path)
         
         # 检查文件是否被创建
-        assert os.path.exists(f"{model_path}.pkl")
+        assert os.path.exists(f"{model_path}.npz")
         assert os.path.exists(f"{model_path}_metadata.json")
         
         # 加载模型
@@ -119,4 +119,7 @@ def test_model_save_load():
         loaded_prediction = loaded_classifier.predict(test_text)
         
         # 预测结果应该相同
-        assert original_prediction[0] == loaded_prediction[0] 
\ No newline at end of file
+        assert original_prediction[0] == loaded_prediction[0]
+        
+        # 从.npz加载的模型仍使用float32特征矩阵
+        assert loaded_classifier.vectorizer.transform([test_text]).dtype == np.float32 
\ No newline at end of file
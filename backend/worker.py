@@ -1,14 +1,14 @@
 import os
 import sys
+import asyncio
 import logging
-import time
 import signal
-import threading
 
 # 添加项目根目录到 Python 路径
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from app.services.rabbitmq_tasks import setup_document_processor
+# 应用模块在函数内导入：PDF提取进程池以spawn方式启动子进程，子进程会以__mp_main__重新导入本文件，
+# 顶层导入会让每个子进程都加载spaCy模型并创建数据库连接
 
 
 # 配置日志
@@ -17,49 +17,55 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
-# 全局变量，用于控制工作线程
-running = True
 
-
-def signal_handler(signum, frame):
-    """处理信号，优雅地关闭工作线程"""
-    global running
-    logging.info(f"Received signal {signum}, shutting down...")
-    running = False
-
-
-def start_worker():
-    """启动工作线程"""
-    try:
-        # 启动文档处理器
-        logging.info("Starting document processor...")
-        setup_document_processor()
-    except Exception as e:
-        logging.error(f"Error in document processor: {e}")
+async def run_worker() -> None:
+    """运行文档处理器，直到收到停止信号或处理器退出"""
+    from app.services.rabbitmq_tasks import consume_documents
+    
+    shutdown_event = asyncio.Event()
+    
+    def signal_handler(signum: int) -> None:
+        """处理信号，优雅地关闭文档处理器"""
+        logging.info(f"Received signal {signum}, shutting down...")
+        shutdown_event.set()
+    
+    # 注册信号处理器
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, signal_handler, signum)
+    
+    # 启动文档处理器
+    logging.info("Starting document processor...")
+    consumer = asyncio.create_task(consume_documents())
+    stopper = asyncio.create_task(shutdown_event.wait())
+    await asyncio.wait({consumer, stopper}, return_when=asyncio.FIRST_COMPLETED)
+    
+    if consumer.done():
+        stopper.cancel()
+        if not consumer.cancelled() and consumer.exception():
+            logging.error(f"Error in document processor: {consumer.exception()}")
+    else:
+        # 未确认的消息会由RabbitMQ重新投递
+        consumer.cancel()
+        try:
+            await consumer
+        except asyncio.CancelledError:
+            pass
 
 
 def main():
     """主函数"""
-    # 注册信号处理器
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    from app.ml.model import get_model_reloader
     
     logging.info("Starting worker process...")
     
-    # 在单独的线程中启动工作线程
-    worker_thread = threading.Thread(target=start_worker)
-    worker_thread.daemon = True
-    worker_thread.start()
+    # 预先加载分类模型，并在后台检查模型更新
+    get_model_reloader()
     
-    # 主线程保持活跃状态，直到收到信号
-    try:
-        while running and worker_thread.is_alive():
-            time.sleep(1)
-    except KeyboardInterrupt:
-        logging.info("Keyboard interrupt received, shutting down...")
+    asyncio.run(run_worker())
     
     logging.info("Worker shutdown complete")
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()